@@ -4,6 +4,8 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.api.routes import router
+from app.services.price_service import init_enrichment_store
+from app.services.warmup import start_warmup
 
 def create_app() -> FastAPI:
     """Build and configure the FastAPI application."""
@@ -30,6 +32,13 @@ def create_app() -> FastAPI:
     )
 
     app.include_router(router)
+
+    @app.on_event("startup")
+    def _warm_up_clients() -> None:
+        # 저장해 둔 장소 보강 캐시를 불러오고, 첫 사용자 요청이 콜드 스타트 비용을 떠안지 않도록 백그라운드에서 예열합니다.
+        init_enrichment_store()
+        start_warmup()
+
     return app
 
 
@@ -1,8 +1,9 @@
 """Route definitions for the travel outfit recommendation API."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from app.services.price_service import predict_price_service
-from app.services.recommendation_service import generate_recommendations 
+from app.services.recommendation_service import generate_recommendations, stream_recommendations
 from app.services.chatbot_service import handle_java_chatbot_request
 from app.models import (
     PricePredictionRequest,
@@ -17,15 +18,21 @@ router = APIRouter()
 
 # 1. 옷차림 추천 
 @router.post("/recommendations", response_model=WeatherRecommendationResponse)
-def get_weather_recommendations(
+async def get_weather_recommendations(
     request: WeatherRecommendationRequest,
-) -> WeatherRecommendationResponse:
+    http_request: Request,
+):
     """
     여행 도시, 시작일, 종료일을 받아 일자별 날씨와
     종합 옷차림 추천을 JSON으로 반환합니다.
+    Accept: text/event-stream 요청이면 날씨를 먼저 보내고 추천문을 생성되는 대로 SSE로 스트리밍합니다.
     """
+    if "text/event-stream" in http_request.headers.get("accept", ""):
+        events = await stream_recommendations(request)
+        return StreamingResponse(events, media_type="text/event-stream")
+
     # 핵심: 비즈니스 로직을 서비스 레이어(generate_recommendations)로 위임
-    return generate_recommendations(request)
+    return await generate_recommendations(request)
 
 
 # 2. 챗봇 엔드포인트
@@ -26,6 +26,15 @@ class Settings:
     google_places_api_key: str = os.getenv("GOOGLE_PLACES_API_KEY", "").strip()
     gemini_api_key: str = os.getenv("GEMINI_API_KEY", "").strip()
     gemini_api_url: str = os.getenv("GEMINI_API_URL", "").strip() 
+    gemini_model: str = os.getenv("GEMINI_MODEL", "gemini-2.5-flash").strip()
+    # Gemini 호출 제한 시간(초). 넘기면 규칙 기반 추천 등 대체 경로로 넘어갑니다.
+    gemini_timeout: float = float(os.getenv("GEMINI_TIMEOUT", "8"))
+    # 여러 장소를 한 번에 처리하는 가격/요약 배치 호출은 출력이 길어 제한 시간을 따로 둡니다.
+    gemini_batch_timeout: float = float(os.getenv("GEMINI_BATCH_TIMEOUT", "30"))
+    # 모든 날짜가 시즌 평균 대체값이면 Gemini 대신 규칙 기반 추천을 바로 사용합니다.
+    skip_gemini_on_full_fallback: bool = os.getenv("SKIP_GEMINI_ON_FULL_FALLBACK", "true").lower() in ("1", "true", "yes")
+    # 빈 문자열이면 Gemini 장소 추정치 캐시를 디스크에 저장하지 않습니다.
+    enrichment_db_path: str = os.getenv("ENRICHMENT_DB_PATH", str(BASE_DIR / "enrichments.db")).strip()
     
     allowed_origins: List[str] = field(
         default_factory=lambda: [
@@ -8,8 +8,13 @@ from app.services.search_service import (
     call_google_places,
     detect_place_category,
     parse_blocks_from_plan,
+    prefetch_places,
+    time_of_day_seconds,
 )
 
+# 1일차 기존 숙소를 찾을 때 보는 시간대 (21:00 ~ 23:59, 자정 기준 초)
+ACCOMMODATION_WINDOW_SECONDS = (21 * 3600, 23 * 3600 + 59 * 60)
+
 
 def get_existing_blocks_for_date(planContext: dict, date_str: str) -> List[Dict[str, Any]]:
     """
@@ -59,9 +64,9 @@ def has_time_conflict(existing_blocks: List[Dict[str, Any]], start_time: str, en
     if not existing_blocks:
         return False
 
-    # 체크할 시간을 time 객체로 변환
-    check_start = datetime.strptime(start_time, "%H:%M:%S").time()
-    check_end = datetime.strptime(end_time, "%H:%M:%S").time()
+    # 체크할 시간을 자정 기준 초로 변환
+    check_start = time_of_day_seconds(start_time)
+    check_end = time_of_day_seconds(end_time)
 
     for block in existing_blocks:
         block_start = block.get("blockStartTime")
@@ -70,11 +75,9 @@ def has_time_conflict(existing_blocks: List[Dict[str, Any]], start_time: str, en
         if not block_start or not block_end:
             continue
 
-        # 문자열이면 time 객체로 변환
-        if isinstance(block_start, str):
-            block_start = datetime.strptime(block_start, "%H:%M:%S").time()
-        if isinstance(block_end, str):
-            block_end = datetime.strptime(block_end, "%H:%M:%S").time()
+        # 문자열/배열/time 모두 자정 기준 초로 변환
+        block_start = time_of_day_seconds(block_start)
+        block_end = time_of_day_seconds(block_end)
 
         # 시간 겹침 체크
         # A와 B가 겹치는 조건: A.start < B.end AND B.start < A.end
@@ -84,6 +87,11 @@ def has_time_conflict(existing_blocks: List[Dict[str, Any]], start_time: str, en
     return False
 
 
+def _dinner_query(destination: str, day_number: int) -> str:
+    """저녁 맛집 검색어 (짝수 일차는 회, 홀수 일차는 고기)"""
+    return f"{destination} 회 맛집" if day_number % 2 == 0 else f"{destination} 고기 맛집"
+
+
 def create_auto_schedule(
     days: int,
     start_date: str,
@@ -115,34 +123,42 @@ def create_auto_schedule(
     # 목적지로 기본 위치 검색 (첫 검색용)
     location = planContext.get("TravelName")
 
+    # 일정에 쓰일 검색어 (일자별 맛집/관광지/저녁 + 필요하면 숙소)
+    queries = [f"{destination} 맛집", f"{destination} 관광지"]
+    queries += [_dinner_query(destination, day_number) for day_number in range(1, min(days, 2) + 1)]
+
     # 숙소 처리: 1일차에 이미 숙소가 있으면 그것을 사용, 없으면 새로 검색
     accommodation_place = None
+    existing_accommodation = None
     if days > 1:  # 2일 이상일 때만 숙소 필요
         # 1일차 날짜 계산
         first_date_str = start_date_obj.strftime("%Y-%m-%d")
         first_day_blocks = get_existing_blocks_for_date(planContext, first_date_str)
 
         # 1일차에 숙소 시간대(21:00-23:59)에 있는 장소 찾기
-        existing_accommodation = None
         for block in first_day_blocks:
             block_start = block.get("blockStartTime")
             block_end = block.get("blockEndTime")
 
             if block_start and block_end:
-                # 문자열이면 time 객체로 변환
-                if isinstance(block_start, str):
-                    block_start = datetime.strptime(block_start, "%H:%M:%S").time()
-                if isinstance(block_end, str):
-                    block_end = datetime.strptime(block_end, "%H:%M:%S").time()
+                # 자정 기준 초로 변환
+                block_start = time_of_day_seconds(block_start)
+                block_end = time_of_day_seconds(block_end)
 
                 # 21:00-23:59 시간대와 겹치는 블록 찾기
-                accommodation_start = datetime.strptime("21:00:00", "%H:%M:%S").time()
-                accommodation_end = datetime.strptime("23:59:00", "%H:%M:%S").time()
+                accommodation_start, accommodation_end = ACCOMMODATION_WINDOW_SECONDS
 
                 if block_start < accommodation_end and accommodation_start < block_end:
                     existing_accommodation = block
                     break
 
+        if not existing_accommodation:
+            queries.append(f"{destination} 호텔")
+
+    # 서로 독립적인 검색들을 미리 동시에 보내 두면 아래 순차 호출은 캐시에서 바로 처리됩니다.
+    prefetch_places(queries, location=location)
+
+    if days > 1:
         if existing_accommodation:
             # 1일차에 숙소가 있으면 그것을 사용
             accommodation_place = {
@@ -295,7 +311,7 @@ def create_daily_schedule(
     # 4. 저녁 맛집 (18:00-19:00)
     if not has_time_conflict(existing_blocks, *predefined_slots["dinner"]):
         dinner_block = create_place_block(
-            query=f"{destination} 회 맛집" if day_number % 2 == 0 else f"{destination} 고기 맛집",
+            query=_dinner_query(destination, day_number),
             start_time="18:00:00",
             end_time="19:00:00",
             date_str=date_str,
@@ -4,11 +4,37 @@ from app.services.search_service import (
 )
 from app.services.auto_schedule import create_auto_schedule
 from app.models import ChatBotActionResponse, ActionData
-from app.services.gemini import gemini_model
+from app.services.gemini import gemini_model, build_generation_config, build_tools
+from app.services import json_codec
 from datetime import datetime, timedelta
 import json
+import logging
 import re
 
+logger = logging.getLogger("uvicorn.error")
+
+
+def _run_single_place_search(**args):
+    """search_and_create_place_block 결과를 다중 검색과 같은 블록 리스트 형태로 맞춥니다."""
+    block = search_and_create_place_block(**args)
+    return [] if "error" in block else [block]
+
+
+# Gemini function_call 이름 -> 블록 리스트를 반환하는 핸들러
+_TOOL_HANDLERS = {
+    "search_and_create_place_block": _run_single_place_search,
+    "search_multiple_place_blocks": search_multiple_place_blocks,
+}
+
+# 요청마다 동일한 Gemini Tools / 생성 설정은 모듈 로드 시 한 번만 만들어 둡니다.
+_TOOLS = build_tools([search_and_create_place_block, search_multiple_place_blocks])
+_GENERATION_CONFIG = build_generation_config({
+    "temperature": 0.7,
+    "top_p": 0.95,
+    "top_k": 40,
+    "max_output_tokens": 8192,
+})
+
 
 def handle_java_chatbot_request(planId, message, systemPromptContext, planContext, previousPrompts=None):
 
@@ -41,8 +67,8 @@ def handle_java_chatbot_request(planId, message, systemPromptContext, planContex
         else:
             start_date = datetime.now().strftime("%Y-%m-%d")
 
-        print(f"[AUTO_SCHEDULE] {nights}박{days}일 자동 일정 생성 시작: {destination}, {start_date}")
-        print(f"[AUTO_SCHEDULE] 기존 일정: {existing_days}일차, 요청: {days}일차")
+        logger.info("[AUTO_SCHEDULE] %s박%s일 자동 일정 생성 시작: %s, %s", nights, days, destination, start_date)
+        logger.info("[AUTO_SCHEDULE] 기존 일정: %s일차, 요청: %s일차", existing_days, days)
 
         # 자동 일정 생성 (기존 일정 고려)
         result = create_auto_schedule(
@@ -166,21 +192,11 @@ def handle_java_chatbot_request(planId, message, systemPromptContext, planContex
 
     full_prompt += f"사용자 메시지: {message}\n"
 
-    # 🔹 2) Gemini Tools 정의
-    tools = [search_and_create_place_block, search_multiple_place_blocks]
-
-    # 🔹 3) Gemini 요청
-    generation_config = {
-        "temperature": 0.7,
-        "top_p": 0.95,
-        "top_k": 40,
-        "max_output_tokens": 8192,
-    }
-
+    # 🔹 2) Gemini Tools 정의 / 3) Gemini 요청 (모듈 상수 _TOOLS, _GENERATION_CONFIG 재사용)
     response = gemini_model.generate_content(
         full_prompt,
-        tools=tools,
-        generation_config=generation_config
+        tools=_TOOLS,
+        generation_config=_GENERATION_CONFIG
     )
 
     actions = []
@@ -190,7 +206,7 @@ def handle_java_chatbot_request(planId, message, systemPromptContext, planContex
     # =========================================================
     for cand in response.candidates:
         content = cand.content
-        print(content)
+        logger.debug("Gemini candidate content: %s", content)
 
         if not content or not hasattr(content, "parts"):
             continue
@@ -205,6 +221,10 @@ def handle_java_chatbot_request(planId, message, systemPromptContext, planContex
                 continue
 
             fn_name = part.function_call.name
+            handler = _TOOL_HANDLERS.get(fn_name)
+            if handler is None:
+                continue
+
             args = dict(part.function_call.args) if part.function_call.args else {}
 
             # planContext를 올바르게 설정 (Gemini가 잘못 채운 경우 덮어쓰기)
@@ -214,41 +234,23 @@ def handle_java_chatbot_request(planId, message, systemPromptContext, planContex
             if "timeTableId" in args and isinstance(args["timeTableId"], float):
                 args["timeTableId"] = int(args["timeTableId"])
 
-            # ===== 단일 검색 =====
-            if fn_name == "search_and_create_place_block":
-                block = search_and_create_place_block(**args)
+            # 단일/다중 검색 모두 블록 리스트를 반환하므로 한 번의 조회로 처리
+            blocks = handler(**args)
 
-                if "error" in block:
-                    return ChatBotActionResponse(
-                        userMessage="죄송합니다. 요청하신 장소를 찾을 수 없어요. Google Places API 오류가 발생했거나 검색 결과가 없습니다.",
-                        hasAction=False,
-                        actions=[]
-                    )
+            if not blocks:
+                return ChatBotActionResponse(
+                    userMessage="죄송합니다. 요청하신 장소를 찾을 수 없어요. Google Places API 오류가 발생했거나 검색 결과가 없습니다.",
+                    hasAction=False,
+                    actions=[]
+                )
 
+            for b in blocks:
                 actions.append(ActionData(
                     action="create",
                     targetName="timeTablePlaceBlock",
-                    target=block
+                    target=b
                 ))
 
-            # ===== 다중 검색 =====
-            elif fn_name == "search_multiple_place_blocks":
-                blocks = search_multiple_place_blocks(**args)
-
-                if len(blocks) == 0:
-                    return ChatBotActionResponse(
-                        userMessage="죄송합니다. 요청하신 장소를 찾을 수 없어요. Google Places API 오류가 발생했거나 검색 결과가 없습니다.",
-                        hasAction=False,
-                        actions=[]
-                    )
-
-                for b in blocks:
-                    actions.append(ActionData(
-                        action="create",
-                        targetName="timeTablePlaceBlock",
-                        target=b
-                    ))
-
     # =========================================================
     # 5) function_call이 있었으면 ActionResponse 반환
     # =========================================================
@@ -281,7 +283,7 @@ def handle_java_chatbot_request(planId, message, systemPromptContext, planContex
             raw = raw[:-3]
 
         raw = raw.strip()
-        data = json.loads(raw)
+        data = json_codec.loads(raw)
 
         return ChatBotActionResponse(
             userMessage=data.get("userMessage", ""),
@@ -290,6 +292,7 @@ def handle_java_chatbot_request(planId, message, systemPromptContext, planContex
         )
     except Exception as e:
         # JSON 파싱 실패 시, 일반 텍스트 응답으로 처리
+        logger.warning("Gemini JSON 응답 파싱 실패, 텍스트 응답으로 처리합니다: %s", e)
         try:
             text_response = response.text.strip()
             if text_response:
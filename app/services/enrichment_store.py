@@ -0,0 +1,93 @@
+"""SQLite persistence for Gemini place enrichments (price estimates, summaries)."""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+from app.services import json_codec
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class EnrichmentStore:
+    """Key/value table that keeps enrichment cache entries across process restarts.
+
+    쓰기는 백그라운드 스레드가 큐에서 모아 한 번에 커밋(write-behind)하므로
+    요청 처리 경로에서 디스크 I/O를 기다리지 않습니다.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS enrichments ("
+            "key TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, created_at INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Tuple[str, str, str, int]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._drain, name="enrichment-store-writer", daemon=True)
+        self._writer.start()
+
+    def load(self, kind: str, max_age: float) -> List[Tuple[str, Any, float]]:
+        """Return ``(key, value, age_seconds)`` for entries of ``kind`` younger than ``max_age``."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                # 오래된 것부터 읽어 LRU에 넣어야 용량이 넘칠 때 최신 항목이 남습니다.
+                "SELECT key, payload, created_at FROM enrichments WHERE kind = ? AND created_at > ? "
+                "ORDER BY created_at",
+                (kind, int(now - max_age)),
+            ).fetchall()
+
+        entries = []
+        for key, payload, created_at in rows:
+            try:
+                entries.append((key, json_codec.loads(payload), now - created_at))
+            except ValueError:
+                continue
+        return entries
+
+    def purge_expired(self, max_age: float) -> int:
+        """Delete entries older than ``max_age`` seconds and return how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM enrichments WHERE created_at < ?", (int(time.time() - max_age),)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def put(self, key: str, kind: str, value: Any) -> None:
+        """Queue an entry for persistence without blocking the caller."""
+        self._queue.put((key, kind, json_codec.dumps(value), int(time.time())))
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with self._lock:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO enrichments (key, kind, payload, created_at) VALUES (?, ?, ?, ?)",
+                        batch,
+                    )
+                    self._conn.commit()
+            except sqlite3.Error as exc:  # pragma: no cover - disk errors
+                logger.error("Enrichment store write failed: %s", exc)
+
+
+def open_enrichment_store(path: str) -> Optional[EnrichmentStore]:
+    """Open the store at ``path``; an empty path or an unusable file disables persistence."""
+    if not path:
+        return None
+    try:
+        return EnrichmentStore(path)
+    except sqlite3.Error as exc:  # pragma: no cover - defensive logging
+        logger.warning("Enrichment store unavailable (%s): %s", path, exc)
+        return None
@@ -1,17 +1,23 @@
 """Gemini model initialisation and utilities."""
 
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 from app.config import settings
 
 try:
     import google.generativeai as genai
+    from google.generativeai.types import content_types, generation_types
 except ImportError:  # pragma: no cover - optional dependency
     genai = None
 
 
 def init_gemini_model() -> Optional[Any]:
-    """Configure Gemini SDK and return the first available model."""
+    """Configure Gemini SDK and return the configured model.
+
+    모델 목록 조회(list_models)는 프로세스 시작마다 네트워크 왕복이 발생하므로 하지 않고,
+    settings.gemini_model(GEMINI_MODEL 환경변수)로 지정된 모델을 바로 생성합니다.
+    잘못된 모델명은 첫 generate_content 호출에서 오류로 드러나며, 호출부의 fallback이 처리합니다.
+    """
     if not settings.gemini_api_key:
         print("ℹ️ Gemini API 키가 설정되지 않았습니다. 규칙 기반 추천만 사용합니다.")
         return None
@@ -22,25 +28,39 @@ def init_gemini_model() -> Optional[Any]:
 
     try:
         genai.configure(api_key=settings.gemini_api_key)
-        available_models = [
-            m.name for m in genai.list_models() if "generateContent" in m.supported_generation_methods
-        ]
-        for candidate in (
-            "models/gemini-2.5-flash",
-            "models/gemini-2.0-flash",
-            "models/gemini-flash-latest",
-        ):
-            if candidate in available_models:
-                model_id = candidate.replace("models/", "")
-                print(f"✅ Gemini 모델 사용: {model_id}")
-                return genai.GenerativeModel(model_id)
-
-        print("⚠️ 사용 가능한 Gemini 모델이 없습니다. 규칙 기반 추천만 사용합니다.")
-        return None
+        model_id = (settings.gemini_model or "gemini-2.5-flash").replace("models/", "")
+        print(f"✅ Gemini 모델 사용: {model_id}")
+        return genai.GenerativeModel(model_id)
     except Exception as exc:  # pragma: no cover - defensive logging
         print(f"⚠️ Gemini 설정 오류: {exc}")
         return None
 
 
+def build_generation_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a generation config (including response_schema) to the SDK request form once.
+
+    SDK는 dict 형태의 response_schema를 호출마다 proto Schema로 변환하므로,
+    모듈 로드 시 한 번 변환해 두고 그대로 재사용합니다.
+    """
+    if genai is None:
+        return config
+    try:
+        return generation_types.to_generation_config_dict(config)
+    except Exception as exc:  # pragma: no cover - defensive logging
+        print(f"⚠️ Gemini generation_config 변환 실패: {exc}")
+        return config
+
+
+def build_tools(functions: List[Any]) -> Any:
+    """Build the SDK function library for tool calling once instead of per request."""
+    if genai is None:
+        return functions
+    try:
+        return content_types.to_function_library(functions)
+    except Exception as exc:  # pragma: no cover - defensive logging
+        print(f"⚠️ Gemini tools 변환 실패: {exc}")
+        return functions
+
+
 gemini_model = init_gemini_model()
 
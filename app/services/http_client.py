@@ -0,0 +1,25 @@
+"""Shared HTTP session factory for outbound API calls (Google Places, OpenWeatherMap)."""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def build_session(pool_maxsize: int = 32, retries: int = 2) -> requests.Session:
+    """Return a keep-alive ``requests.Session`` with a sized connection pool and GET retries.
+
+    모듈마다 하나씩 만들어 재사용하면 호출마다 TCP/TLS 연결을 새로 맺지 않습니다.
+    일시적인 게이트웨이 오류(502/503/504)는 짧은 backoff 후 재시도합니다.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -1,8 +1,10 @@
 import json
 import logging
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional, Tuple
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import html as _html
+import re
 
 from app.models import (
     PricePredictionRequest, PricePredictionResponse,
@@ -10,7 +12,11 @@ from app.models import (
     DailyCostSummary, TripTotalSummary,
     FoodCostDetail, AccommodationCostDetail, CostRange
 )
-from app.services.gemini import gemini_model
+from app.services.gemini import gemini_model, build_generation_config
+from app.services.cache import TTLCache
+from app.services import json_codec
+from app.services.enrichment_store import EnrichmentStore, open_enrichment_store
+from app.config import settings
 import time
 
 logger = logging.getLogger("uvicorn.error")
@@ -19,9 +25,105 @@ DEFAULT_FOOD_PRICE = 15000
 DEFAULT_FOOD_RANGE = (12000, 18000)
 DEFAULT_ACCOM_RANGE = (50000, 100000)
 
-_food_cache: Dict[str, Dict] = {}
-_accom_cache: Dict[str, Dict] = {}
-_summary_cache: Dict[str, str] = {}
+# Gemini가 배치 응답을 항상 JSON 배열 구조로 돌려주도록 강제하는 스키마
+_ENRICHMENT_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "food": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "refId": {"type": "string"},
+                    "estimatedPrice": {"type": "integer"},
+                    "priceRange": {"type": "array", "items": {"type": "integer"}},
+                    "menuExamples": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["refId"],
+            },
+        },
+        "accommodation": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "refId": {"type": "string"},
+                    "recommendedRoomType": {"type": "string"},
+                    "roomTypes": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "type": {"type": "string"},
+                                "priceRange": {"type": "array", "items": {"type": "integer"}},
+                            },
+                        },
+                    },
+                },
+                "required": ["refId"],
+            },
+        },
+        "summaries": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "refId": {"type": "string"},
+                    "summary": {"type": "string"},
+                },
+                "required": ["refId"],
+            },
+        },
+    },
+}
+
+_ENRICHMENT_GENERATION_CONFIG = build_generation_config({
+    "response_mime_type": "application/json",
+    "response_schema": _ENRICHMENT_RESPONSE_SCHEMA,
+})
+
+# 장소별 AI 추정치 캐시 (용량 제한 LRU + 하루 TTL)
+ENRICHMENT_CACHE_MAXSIZE = 10_000
+ENRICHMENT_CACHE_TTL_SECONDS = 24 * 60 * 60
+# 이보다 짧은 장소 요약은 잘렸거나 내용이 빈약한 응답으로 보고 캐시하지 않습니다 (다음 요청에서 재생성).
+SUMMARY_CACHE_MIN_LENGTH = 20
+
+_food_cache = TTLCache(maxsize=ENRICHMENT_CACHE_MAXSIZE, ttl=ENRICHMENT_CACHE_TTL_SECONDS)
+_accom_cache = TTLCache(maxsize=ENRICHMENT_CACHE_MAXSIZE, ttl=ENRICHMENT_CACHE_TTL_SECONDS)
+_summary_cache = TTLCache(maxsize=ENRICHMENT_CACHE_MAXSIZE, ttl=ENRICHMENT_CACHE_TTL_SECONDS)
+# 장소별 보충 호출에서도 요약을 얻지 못한 장소는 잠시 재호출하지 않습니다 (디스크에는 남기지 않음).
+SUMMARY_MISS_TTL_SECONDS = 60
+_summary_miss_cache = TTLCache(maxsize=ENRICHMENT_CACHE_MAXSIZE, ttl=SUMMARY_MISS_TTL_SECONDS)
+
+# 재시작 후에도 이미 조회한 장소는 Gemini를 다시 호출하지 않도록 캐시를 SQLite에 보관
+# (모듈 import만으로 디스크/스레드를 건드리지 않도록 앱 startup 시 init_enrichment_store로 엽니다)
+_enrichment_store: Optional[EnrichmentStore] = None
+_PERSISTED_CACHES = (("food", _food_cache), ("accom", _accom_cache), ("summary", _summary_cache))
+
+
+def init_enrichment_store() -> None:
+    """Open the persistent enrichment store and warm the in-memory caches from it (idempotent)."""
+    global _enrichment_store
+    if _enrichment_store is not None:
+        return
+    _enrichment_store = open_enrichment_store(settings.enrichment_db_path)
+    if _enrichment_store is None:
+        return
+    # 만료된 행은 다시 읽히지 않으므로 열 때 지워 DB가 계속 커지지 않게 합니다.
+    removed = _enrichment_store.purge_expired(ENRICHMENT_CACHE_TTL_SECONDS)
+    if removed:
+        logger.info("Purged %d expired enrichment rows", removed)
+    for kind, cache in _PERSISTED_CACHES:
+        for key, value, age in _enrichment_store.load(kind, ENRICHMENT_CACHE_TTL_SECONDS):
+            cache.set(key, value, ttl=ENRICHMENT_CACHE_TTL_SECONDS - age)
+
+
+def _remember(cache: TTLCache, kind: str, key: str, value) -> None:
+    """Store an enrichment in memory and queue it for persistence."""
+    cache[key] = value
+    if _enrichment_store is not None:
+        _enrichment_store.put(key, kind, value)
+
 
 
 def _food_cache_key(block: PlaceBlockVO) -> str:
@@ -38,115 +140,154 @@ def _summary_cache_key(block: PlaceBlockVO) -> str:
 def predict_price_service(request: PricePredictionRequest) -> PricePredictionResponse:
     headcount = request.headcount
 
+    # 블록별 데이터는 request.placeBlocks 의 인덱스로 접근하는 리스트(SoA)에 보관합니다.
+    blocks = request.placeBlocks
+    n_blocks = len(blocks)
+
+    # 같은 장소(캐시 키 동일)가 여러 블록에 나오면 AI 입력 항목은 하나만 만들고
+    # 결과를 모든 블록에 나눠 줍니다. (*_key_to_ref: 캐시 키 -> refId, *_refs: (블록 인덱스, refId))
     food_entries = []
-    food_ref_map: Dict[int, str] = {}
-    food_predictions_map: Dict[int, Dict] = {}
+    food_key_to_ref: Dict[str, str] = {}
+    food_refs: List[Tuple[int, str]] = []
+    food_pred: List[Optional[Dict]] = [None] * n_blocks
 
     accom_entries = []
-    accom_ref_map: Dict[int, str] = {}
-    accom_predictions_map: Dict[int, Dict] = {}
+    accom_key_to_ref: Dict[str, str] = {}
+    accom_refs: List[Tuple[int, str]] = []
+    accom_pred: List[Optional[Dict]] = [None] * n_blocks
 
     summary_entries = []
-    summary_ref_map: Dict[int, str] = {}
-    summary_predictions_map: Dict[int, Dict] = {}
-    block_lookup: Dict[int, PlaceBlockVO] = {}
+    summary_key_to_ref: Dict[str, str] = {}
+    summary_refs: List[Tuple[int, str]] = []
+    summary_pred: List[Optional[Dict]] = [None] * n_blocks
+    summary_blocks: List[PlaceBlockVO] = []  # summary_entries와 같은 순서의 대표 블록 (개별 요약 보충용)
+
+    # 1. Timetable ID -> Date 매핑 생성 & 날짜 정렬
+    # 예: {144: "2025-11-22", 153: "2025-11-23"}
+    # (장소가 없는 날짜도 일별 요약에 포함되도록 날짜 목록은 타임테이블 기준으로 만듭니다)
+    timetable_map = {t.timetableId: t.date for t in request.timeTables}
+    sorted_dates = sorted({t.date for t in request.timeTables})
+
+    # 2. 데이터를 날짜별로 그룹화 (AI 입력 구성과 같은 루프에서 처리)
+    # grouped_blocks["2025-11-22"] = [0, 1, ...]  (blocks 인덱스, 원래 순서 유지 - HTML 렌더링용)
+    # food_by_date / accom_by_date: 같은 날짜의 식당/숙소 인덱스만 미리 분리해 둔 목록
+    grouped_blocks: Dict[str, List[int]] = defaultdict(list)
+    food_by_date: Dict[str, List[int]] = defaultdict(list)
+    accom_by_date: Dict[str, List[int]] = defaultdict(list)
+
+    for i, block in enumerate(blocks):
+        name = block.placeName
+        address = block.placeAddress
+        rating = block.placeRating
+        cat = block.placeCategory
+
+        # block의 timeTableId로 날짜를 찾음
+        date_str = timetable_map.get(block.timeTableId)
+        if date_str:
+            grouped_blocks[date_str].append(i)
+        else:
+            logger.warning(f"Block {block.blockId} has unknown timeTableId {block.timeTableId}")
 
-    for block in request.placeBlocks:
-        block_lookup[id(block)] = block
-        summary_id = f"summary_{len(summary_entries)}"
         summary_key = _summary_cache_key(block)
         cached_summary = _summary_cache.get(summary_key)
         if cached_summary:
-            summary_predictions_map[id(block)] = {"summary": cached_summary}
+            summary_pred[i] = {"summary": cached_summary}
+        elif _summary_miss_cache.get(summary_key):
+            pass
         else:
-            summary_ref_map[id(block)] = summary_id
-            summary_entries.append({
-                "refId": summary_id,
-                "name": block.placeName,
-                "address": block.placeAddress,
-                "category": block.placeCategory,
-                "theme": getattr(block, "placeTheme", None),
-                "rating": block.placeRating,
-            })
-
-        if block.placeCategory == 2:
-            ref = f"food_{len(food_entries)}"
+            summary_id = summary_key_to_ref.get(summary_key)
+            if summary_id is None:
+                summary_id = f"summary_{len(summary_entries)}"
+                summary_key_to_ref[summary_key] = summary_id
+                summary_entries.append({
+                    "refId": summary_id,
+                    "name": name,
+                    "address": address,
+                    "category": cat,
+                    "theme": block.placeTheme,
+                    "rating": rating,
+                })
+                summary_blocks.append(block)
+            summary_refs.append((i, summary_id))
+
+        if cat == 2:
+            if date_str:
+                food_by_date[date_str].append(i)
             food_key = _food_cache_key(block)
             cached_food = _food_cache.get(food_key)
             if cached_food:
-                food_predictions_map[id(block)] = cached_food
+                food_pred[i] = cached_food
             else:
-                food_ref_map[id(block)] = ref
-                food_entries.append({
-                    "refId": ref,
-                    "name": block.placeName,
-                    "address": block.placeAddress,
-                    "rating": block.placeRating,
-                })
-        elif block.placeCategory == 1:
-            ref = f"accom_{len(accom_entries)}"
+                ref = food_key_to_ref.get(food_key)
+                if ref is None:
+                    ref = f"food_{len(food_entries)}"
+                    food_key_to_ref[food_key] = ref
+                    food_entries.append({
+                        "refId": ref,
+                        "name": name,
+                        "address": address,
+                        "rating": rating,
+                    })
+                food_refs.append((i, ref))
+        elif cat == 1:
+            if date_str:
+                accom_by_date[date_str].append(i)
             accom_key = _accom_cache_key(block, headcount)
             cached_accom = _accom_cache.get(accom_key)
             if cached_accom:
-                accom_predictions_map[id(block)] = cached_accom
+                accom_pred[i] = cached_accom
             else:
-                accom_ref_map[id(block)] = ref
-                accom_entries.append({
-                    "refId": ref,
-                    "name": block.placeName,
-                    "address": block.placeAddress,
-                    "rating": block.placeRating,
-                    "headcount": headcount,
-                })
+                ref = accom_key_to_ref.get(accom_key)
+                if ref is None:
+                    ref = f"accom_{len(accom_entries)}"
+                    accom_key_to_ref[accom_key] = ref
+                    accom_entries.append({
+                        "refId": ref,
+                        "name": name,
+                        "address": address,
+                        "rating": rating,
+                        "headcount": headcount,
+                    })
+                accom_refs.append((i, ref))
 
     ai_bundle = _batch_fetch_ai_enrichments(headcount, food_entries, accom_entries, summary_entries)
     food_predictions = {item.get("refId"): item for item in ai_bundle.get("food", []) if item.get("refId")}
     accom_predictions = {item.get("refId"): item for item in ai_bundle.get("accommodation", []) if item.get("refId")}
     summary_predictions = {item.get("refId"): item for item in ai_bundle.get("summaries", []) if item.get("refId")}
 
-    for block_id, ref in food_ref_map.items():
+    # 캐시는 고유 장소(캐시 키)마다 한 번만 채우고, 결과는 같은 refId를 가진 모든 블록에 배분
+    for food_key, ref in food_key_to_ref.items():
         data = food_predictions.get(ref)
         if data:
-            food_predictions_map[block_id] = data
-            block = block_lookup.get(block_id)
-            if block:
-                _food_cache[_food_cache_key(block)] = data
+            _remember(_food_cache, "food", food_key, data)
+    for i, ref in food_refs:
+        food_pred[i] = food_predictions.get(ref)
 
-    for block_id, ref in accom_ref_map.items():
+    for accom_key, ref in accom_key_to_ref.items():
         data = accom_predictions.get(ref)
         if data:
-            accom_predictions_map[block_id] = data
-            block = block_lookup.get(block_id)
-            if block:
-                _accom_cache[_accom_cache_key(block, headcount)] = data
+            _remember(_accom_cache, "accom", accom_key, data)
+    for i, ref in accom_refs:
+        accom_pred[i] = accom_predictions.get(ref)
+
+    # 일괄 호출 자체가 실패했거나 비활성일 때만 장소별 호출로 요약을 보충
+    # (모델이 일부러 비워 둔 장소까지 다시 묻지 않습니다)
+    if not ai_bundle and summary_entries:
+        ref_to_key = {ref: key for key, ref in summary_key_to_ref.items()}
+        for entry, text in zip(summary_entries, _summarize_places(summary_blocks)):
+            if text:
+                summary_predictions[entry["refId"]] = {"summary": text}
+            else:
+                _summary_miss_cache.set(ref_to_key[entry["refId"]], True)
 
-    for block_id, ref in summary_ref_map.items():
+    for summary_key, ref in summary_key_to_ref.items():
         data = summary_predictions.get(ref)
-        if data:
-            summary_predictions_map[block_id] = data
-            block = block_lookup.get(block_id)
-            if block:
-                value = data.get("summary", "") if isinstance(data, dict) else ""
-                if value:
-                    _summary_cache[_summary_cache_key(block)] = value
-    
-    # 1. Timetable ID -> Date 매핑 생성 & 날짜 정렬
-    # 예: {144: "2025-11-22", 153: "2025-11-23"}
-    timetable_map = {t.timetableId: t.date for t in request.timeTables}
-    sorted_dates = sorted(list(set(timetable_map.values())))
-    
-    # 2. 데이터를 날짜별로 그룹화
-    # grouped_blocks["2025-11-22"] = [block1, block2...]
-    grouped_blocks: Dict[str, List[PlaceBlockVO]] = defaultdict(list)
+        value = data.get("summary", "") if isinstance(data, dict) else ""
+        if isinstance(value, str) and len(value.strip()) >= SUMMARY_CACHE_MIN_LENGTH:
+            _remember(_summary_cache, "summary", summary_key, value)
+    for i, ref in summary_refs:
+        summary_pred[i] = summary_predictions.get(ref)
     
-    for block in request.placeBlocks:
-        # block의 timeTableId로 날짜를 찾음
-        date_str = timetable_map.get(block.timeTableId)
-        if date_str:
-            grouped_blocks[date_str].append(block)
-        else:
-            logger.warning(f"Block {block.blockId} has unknown timeTableId {block.timeTableId}")
-
     # 3. 날짜별 비용 계산
     daily_summaries = []
     
@@ -155,11 +296,10 @@ def predict_price_service(request: PricePredictionRequest) -> PricePredictionRes
     grand_accom_min = 0
     grand_accom_max = 0
 
-    # map placeName -> description (generated by AI)
-    place_desc_map: Dict[str, str] = {}
+    # 블록 인덱스 -> AI 장소 설명 (같은 이름의 장소가 여러 번 나와도 블록별로 구분)
+    place_descs: List[str] = [""] * n_blocks
 
     for idx, date_str in enumerate(sorted_dates):
-        blocks = grouped_blocks.get(date_str, [])
         
         # 날짜별 임시 저장소
         d_foods = []
@@ -168,46 +308,48 @@ def predict_price_service(request: PricePredictionRequest) -> PricePredictionRes
         d_accom_min = 0
         d_accom_max = 0
         
-        for block in blocks:
-            summary_data = summary_predictions_map.get(id(block))
+        for i in grouped_blocks.get(date_str, []):
+            summary_data = summary_pred[i]
             desc_value = summary_data.get("summary") if isinstance(summary_data, dict) else None
             desc = (desc_value or "").strip()
             if desc:
-                place_desc_map[block.placeName] = desc
-
-            # 카테고리 2: 식당
-            if block.placeCategory == 2:
-                pred = food_predictions_map.get(id(block))
-                p_person = _resolve_food_price(pred)
-                t_price = p_person * headcount
-                menus = pred.get("menuExamples", []) if isinstance(pred, dict) else []
-                d_foods.append(FoodCostDetail(
-                    placeName=block.placeName,
-                    pricePerPerson=p_person,
-                    totalPrice=t_price,
-                    menuExamples=menus,
-                    placeDescription=desc
-                ))
-                d_food_total += t_price
-            
-            # 카테고리 1: 숙소
-            elif block.placeCategory == 1:
-                pred = accom_predictions_map.get(id(block))
-                room_type, min_p, max_p = _resolve_accommodation_price(pred, headcount)
-
-                d_accoms.append(AccommodationCostDetail(
-                    placeName=block.placeName,
-                    roomType=room_type,
-                    priceRange=CostRange(min=min_p, max=max_p),
-                    pricePerPerson=CostRange(min=min_p // headcount, max=max_p // headcount)
-                    ,
-                    placeDescription=desc
-                ))
-                d_accom_min += min_p
-                d_accom_max += max_p
+                place_descs[i] = desc
+
+        # 아래 모델들은 이미 타입이 맞춰진 값으로만 만들므로 검증 없이 생성합니다 (model_construct).
+        # AI 응답에서 그대로 오는 값(메뉴, 객실명)만 여기서 타입을 맞춥니다.
+
+        # 카테고리 2: 식당
+        for i in food_by_date.get(date_str, ()):
+            pred = food_pred[i]
+            p_person = _resolve_food_price(pred)
+            t_price = p_person * headcount
+            menus = pred.get("menuExamples") if isinstance(pred, dict) else None
+            menus = [str(m) for m in menus] if isinstance(menus, list) else []
+            d_foods.append(FoodCostDetail.model_construct(
+                placeName=blocks[i].placeName,
+                pricePerPerson=p_person,
+                totalPrice=t_price,
+                menuExamples=menus,
+                placeDescription=place_descs[i]
+            ))
+            d_food_total += t_price
+
+        # 카테고리 1: 숙소
+        for i in accom_by_date.get(date_str, ()):
+            room_type, min_p, max_p, min_pp, max_pp = _resolve_accommodation_price(accom_pred[i], headcount)
+
+            d_accoms.append(AccommodationCostDetail.model_construct(
+                placeName=blocks[i].placeName,
+                roomType=str(room_type),
+                priceRange=CostRange.model_construct(min=min_p, max=max_p),
+                pricePerPerson=CostRange.model_construct(min=min_pp, max=max_pp),
+                placeDescription=place_descs[i]
+            ))
+            d_accom_min += min_p
+            d_accom_max += max_p
 
         # 일별 요약 생성
-        daily_summary = DailyCostSummary(
+        daily_summary = DailyCostSummary.model_construct(
             date=date_str,
             dayNumber=idx + 1,
             foodDetails=d_foods,
@@ -242,7 +384,7 @@ def predict_price_service(request: PricePredictionRequest) -> PricePredictionRes
 
     # Build HTML for direct display (frontend can use this HTML instead of raw JSON)
     try:
-        rendered = _build_html(daily_summaries, trip_summary, grouped_blocks, place_desc_map)
+        rendered = "".join(_stream_html(daily_summaries, trip_summary, blocks, grouped_blocks, place_descs))
     except Exception as e:
         logger.error(f"Failed to build HTML render: {e}")
         rendered = None
@@ -254,99 +396,116 @@ def predict_price_service(request: PricePredictionRequest) -> PricePredictionRes
     )
 
 
-def _build_html(daily_summaries: List[DailyCostSummary], trip_summary: TripTotalSummary, grouped_blocks: Dict[str, List[PlaceBlockVO]], place_desc_map: Dict[str, str]) -> str:
-    """Build a simple, safe HTML string for direct display in the frontend.
+# _stream_html 에서 반복 사용하는 인라인 스타일 태그 (호출마다 다시 만들지 않도록 모듈 상수로 둡니다)
+_DAY_SECTION_OPEN = (
+    '<section style="border:1px solid #e5e7eb;padding:12px;border-radius:6px;margin-bottom:12px;background:#fff">'
+    '<div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:8px">'
+)
+_PLACE_LIST_OPEN = '<ul style="margin:0;padding:0;list-style:none;display:grid;grid-template-columns:repeat(auto-fill,minmax(220px,1fr));gap:8px">'
+_PLACE_ITEM_OPEN = '<li style="border:1px solid #e5e7eb;padding:8px;border-radius:6px;background:#f9fafb">'
+_DIV_DETAIL_CARD = '<div style="border:1px solid #eef2ff;padding:8px;border-radius:6px;background:#fff">'
+_DIV_HEADING = '<div style="font-weight:600;margin-bottom:6px">'
+_DIV_BOLD = '<div style="font-weight:600">'
+_DIV_MUTED_12 = '<div style="font-size:12px;color:#6b7280">'
+_DIV_MUTED_13 = '<div style="font-size:13px;color:#6b7280">'
+_DIV_TEXT_13 = '<div style="font-size:13px;color:#374151">'
+_DIV_DESC = '<div style="margin-top:6px;color:#374151">'
+
+# 고정 마크업이 대부분인 머리말/전체 요약 영역은 통째로 한 조각으로 만들어 둡니다.
+_HTML_HEADER = '<div class="price-summary-root"><h2 style="margin:0 0 8px 0;font-size:18px">여행 비용 요약</h2>'
+_TRIP_SUMMARY_TEMPLATE = (
+    '<section style="padding:12px;border-radius:6px;background:#fff;border:1px solid #e5e7eb">'
+    '<h3 style="margin:0 0 6px 0;font-size:16px">여행 전체 요약</h3>'
+    + _DIV_TEXT_13 + '식비 합계: {food}원</div>'
+    + _DIV_TEXT_13 + '숙박 합계: {accom_min} ~ {accom_max}원</div>'
+    + _DIV_TEXT_13 + '1인당 예상: {pp_min} ~ {pp_max}원</div>'
+    '</section></div>'
+)
+
+
+def _stream_html(daily_summaries: List[DailyCostSummary], trip_summary: TripTotalSummary, blocks: List[PlaceBlockVO], grouped_blocks: Dict[str, List[int]], place_descs: List[str]) -> Iterator[str]:
+    """Yield a simple, safe HTML document fragment by fragment for direct display in the frontend.
     Use minimal inline classes — front can style further if needed.
+    Callers join the fragments (``"".join(...)``) or stream them as they are produced.
     """
+    escape = _html.escape
+
     def esc(s):
-        return _html.escape(str(s)) if s is not None else ''
+        if isinstance(s, str):
+            return escape(s)
+        return escape(str(s)) if s is not None else ''
 
-    parts = []
-    parts.append('<div class="price-summary-root">')
-    parts.append('<h2 style="margin:0 0 8px 0;font-size:18px">여행 비용 요약</h2>')
+    yield _HTML_HEADER
 
     for daily in daily_summaries:
-        parts.append(f'<section style="border:1px solid #e5e7eb;padding:12px;border-radius:6px;margin-bottom:12px;background:#fff">')
-        parts.append(f'<div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:8px">')
-        parts.append(f'<div><div style="font-size:13px;color:#6b7280">Day {esc(daily.dayNumber)}</div><div style="font-weight:600">{esc(daily.date)}</div></div>')
-        parts.append(f'<div style="font-size:13px;color:#374151">합계: {esc(daily.dailyTotalMin)} ~ {esc(daily.dailyTotalMax)}원</div>')
-        parts.append('</div>')
+        yield _DAY_SECTION_OPEN
+        yield f'<div>{_DIV_MUTED_13}Day {esc(daily.dayNumber)}</div>{_DIV_BOLD}{esc(daily.date)}</div></div>'
+        yield f'{_DIV_TEXT_13}합계: {esc(daily.dailyTotalMin)} ~ {esc(daily.dailyTotalMax)}원</div></div>'
 
         # places (from grouped_blocks)
-        places = grouped_blocks.get(daily.date, []) if grouped_blocks is not None else []
-        parts.append('<div style="margin-bottom:8px">')
-        parts.append('<div style="font-weight:600;margin-bottom:6px">이 날의 장소</div>')
-        if places:
-            parts.append('<ul style="margin:0;padding:0;list-style:none;display:grid;grid-template-columns:repeat(auto-fill,minmax(220px,1fr));gap:8px">')
-            for p in places:
-                parts.append('<li style="border:1px solid #e5e7eb;padding:8px;border-radius:6px;background:#f9fafb">')
-                parts.append(f'<div style="font-weight:600">{esc(p.placeName)}</div>')
+        place_indices = grouped_blocks.get(daily.date, []) if grouped_blocks is not None else []
+        yield f'<div style="margin-bottom:8px">{_DIV_HEADING}이 날의 장소</div>'
+        if place_indices:
+            yield _PLACE_LIST_OPEN
+            for i in place_indices:
+                p = blocks[i]
+                yield f'{_PLACE_ITEM_OPEN}{_DIV_BOLD}{esc(p.placeName)}</div>'
                 if getattr(p, 'placeTheme', None):
-                    parts.append(f'<div style="font-size:12px;color:#6b7280">테마: {esc(p.placeTheme)}</div>')
+                    yield f'{_DIV_MUTED_12}테마: {esc(p.placeTheme)}</div>'
                 if getattr(p, 'placeAddress', None):
-                    parts.append(f'<div style="font-size:12px;color:#6b7280">{esc(p.placeAddress)}</div>')
+                    yield f'{_DIV_MUTED_12}{esc(p.placeAddress)}</div>'
                 if getattr(p, 'placeRating', None) is not None:
-                    parts.append(f'<div style="font-size:12px;color:#6b7280">평점: {esc(p.placeRating)}</div>')
+                    yield f'{_DIV_MUTED_12}평점: {esc(p.placeRating)}</div>'
                     # show AI-generated description for the place if available
-                    pd = place_desc_map.get(p.placeName)
+                    pd = place_descs[i]
                     if pd:
-                        parts.append(f'<div style="margin-top:6px;color:#374151">{esc(pd)}</div>')
-                parts.append('</li>')
-            parts.append('</ul>')
+                        yield f'{_DIV_DESC}{esc(pd)}</div>'
+                yield '</li>'
+            yield '</ul>'
         else:
-            parts.append('<div style="font-size:13px;color:#6b7280">등록된 장소가 없습니다.</div>')
-        parts.append('</div>')
+            yield f'{_DIV_MUTED_13}등록된 장소가 없습니다.</div>'
+        yield '</div>'
 
         # food details
-        parts.append('<div style="margin-bottom:8px">')
-        parts.append('<div style="font-weight:600;margin-bottom:6px">식비</div>')
+        yield f'<div style="margin-bottom:8px">{_DIV_HEADING}식비</div>'
         if daily.foodDetails:
             for f in daily.foodDetails:
-                parts.append('<div style="border:1px solid #eef2ff;padding:8px;border-radius:6px;background:#fff">')
-                parts.append(f'<div style="font-weight:600">{esc(f.placeName)}</div>')
-                parts.append(f'<div style="font-size:12px;color:#6b7280">1인당: {esc(f.pricePerPerson)}원 </div>')
+                yield f'{_DIV_DETAIL_CARD}{_DIV_BOLD}{esc(f.placeName)}</div>{_DIV_MUTED_12}1인당: {esc(f.pricePerPerson)}원 </div>'
                 if getattr(f, 'menuExamples', None):
-                    parts.append(f'<div style="font-size:12px;color:#6b7280">메뉴 예시: {esc(", ".join(f.menuExamples))}</div>')
+                    yield f'{_DIV_MUTED_12}메뉴 예시: {esc(", ".join(f.menuExamples))}</div>'
                 if getattr(f, 'placeDescription', None):
-                    parts.append(f'<div style="margin-top:6px;color:#374151">{esc(f.placeDescription)}</div>')
-                parts.append('</div>')
+                    yield f'{_DIV_DESC}{esc(f.placeDescription)}</div>'
+                yield '</div>'
         else:
-            parts.append('<div style="font-size:13px;color:#6b7280">식당 정보가 없습니다.</div>')
-        parts.append('</div>')
+            yield f'{_DIV_MUTED_13}식당 정보가 없습니다.</div>'
+        yield '</div>'
 
         # accommodation
-        parts.append('<div>')
-        parts.append('<div style="font-weight:600;margin-bottom:6px">숙박</div>')
+        yield f'<div>{_DIV_HEADING}숙박</div>'
         if daily.accommodationDetails:
             for a in daily.accommodationDetails:
-                parts.append('<div style="border:1px solid #eef2ff;padding:8px;border-radius:6px;background:#fff">')
-                parts.append(f'<div style="font-weight:600">{esc(a.placeName)}</div>')
+                yield f'{_DIV_DETAIL_CARD}{_DIV_BOLD}{esc(a.placeName)}</div>'
                 if getattr(a, 'roomType', None):
-                    parts.append(f'<div style="font-size:12px;color:#6b7280">객실: {esc(a.roomType)}</div>')
+                    yield f'{_DIV_MUTED_12}객실: {esc(a.roomType)}</div>'
                 if getattr(a, 'priceRange', None):
-                    parts.append(f'<div style="font-size:12px;color:#6b7280">요금 범위: {esc(a.priceRange.min)} ~ {esc(a.priceRange.max)}원</div>')
+                    yield f'{_DIV_MUTED_12}요금 범위: {esc(a.priceRange.min)} ~ {esc(a.priceRange.max)}원</div>'
                 if getattr(a, 'pricePerPerson', None):
-                    parts.append(f'<div style="font-size:12px;color:#6b7280">1인당: {esc(a.pricePerPerson.min)} ~ {esc(a.pricePerPerson.max)}원</div>')
+                    yield f'{_DIV_MUTED_12}1인당: {esc(a.pricePerPerson.min)} ~ {esc(a.pricePerPerson.max)}원</div>'
                 if getattr(a, 'placeDescription', None):
-                    parts.append(f'<div style="margin-top:6px;color:#374151">{esc(a.placeDescription)}</div>')
-                parts.append('</div>')
+                    yield f'{_DIV_DESC}{esc(a.placeDescription)}</div>'
+                yield '</div>'
         else:
-            parts.append('<div style="font-size:13px;color:#6b7280">숙박 정보가 없습니다.</div>')
-        parts.append('</div>')
-
-        parts.append('</section>')
+            yield f'{_DIV_MUTED_13}숙박 정보가 없습니다.</div>'
+        yield '</div></section>'
 
     # trip summary
-    parts.append('<section style="padding:12px;border-radius:6px;background:#fff;border:1px solid #e5e7eb">')
-    parts.append('<h3 style="margin:0 0 6px 0;font-size:16px">여행 전체 요약</h3>')
-    parts.append(f'<div style="font-size:13px;color:#374151">식비 합계: {esc(trip_summary.totalFoodCost)}원</div>')
-    parts.append(f'<div style="font-size:13px;color:#374151">숙박 합계: {esc(trip_summary.totalAccommodationMin)} ~ {esc(trip_summary.totalAccommodationMax)}원</div>')
-    parts.append(f'<div style="font-size:13px;color:#374151">1인당 예상: {esc(trip_summary.perPersonCost.min)} ~ {esc(trip_summary.perPersonCost.max)}원</div>')
-    parts.append('</section>')
-
-    parts.append('</div>')
-    return '\n'.join(parts)
-
+    yield _TRIP_SUMMARY_TEMPLATE.format(
+        food=esc(trip_summary.totalFoodCost),
+        accom_min=esc(trip_summary.totalAccommodationMin),
+        accom_max=esc(trip_summary.totalAccommodationMax),
+        pp_min=esc(trip_summary.perPersonCost.min),
+        pp_max=esc(trip_summary.perPersonCost.max),
+    )
 
 
 def _batch_fetch_ai_enrichments(headcount: int, food_items: List[Dict], accommodation_items: List[Dict], summary_items: List[Dict]) -> Dict:
@@ -355,17 +514,22 @@ def _batch_fetch_ai_enrichments(headcount: int, food_items: List[Dict], accommod
     if not (food_items or accommodation_items or summary_items):
         return {}
 
-    food_json = json.dumps(food_items, ensure_ascii=False, indent=2)
-    accom_json = json.dumps(accommodation_items, ensure_ascii=False, indent=2)
-    summary_json = json.dumps(summary_items, ensure_ascii=False, indent=2)
+    # 비어 있는 목록은 프롬프트에서 제외하고, 항목은 필드명을 한 번만 적는 행 형식으로 보내 입력 토큰을 줄입니다.
+    input_lines = [f"- 여행 인원수(headcount): {headcount}"]
+    for label, items in (
+        ("FOOD_ITEMS", food_items),
+        ("ACCOMMODATION_ITEMS", accommodation_items),
+        ("SUMMARY_ITEMS", summary_items),
+    ):
+        if items:
+            input_lines.extend(_encode_rows(label, items))
+    input_block = "\n    ".join(input_lines)
 
     prompt = f"""
     당신은 여행 비용과 장소 요약을 한 번에 계산하는 전문 AI입니다. 입력은 여러 장소의 메타데이터이며, 반드시 JSON만 출력해야 합니다.
+    각 목록의 SCHEMA 줄은 열 이름이고, 그 아래 각 줄이 '|'로 구분된 항목 하나입니다. 값 안의 '|'는 '\\|'로 표기되며, 빈 값은 정보 없음을 뜻합니다.
 
-    - 여행 인원수(headcount): {headcount}
-    - FOOD_ITEMS: {food_json}
-    - ACCOMMODATION_ITEMS: {accom_json}
-    - SUMMARY_ITEMS: {summary_json}
+    {input_block}
 
     출력 JSON 스키마 (필요한 배열만 포함):
     {{
@@ -399,7 +563,11 @@ def _batch_fetch_ai_enrichments(headcount: int, food_items: List[Dict], accommod
     """
 
     try:
-        response = gemini_model.generate_content(prompt)
+        response = gemini_model.generate_content(
+            prompt,
+            generation_config=_ENRICHMENT_GENERATION_CONFIG,
+            request_options={"timeout": settings.gemini_batch_timeout},
+        )
         parsed = _parse_json_response(response.text)
         return parsed if isinstance(parsed, dict) else {}
     except Exception as e:
@@ -407,6 +575,21 @@ def _batch_fetch_ai_enrichments(headcount: int, food_items: List[Dict], accommod
         return {}
 
 
+def _encode_rows(label: str, items: List[Dict]) -> List[str]:
+    """Encode same-shaped dicts as a ``<label>_SCHEMA`` header line followed by one pipe-separated row per item."""
+    columns = list(items[0])
+    lines = [f"- {label}_SCHEMA: {'|'.join(columns)}", f"- {label}:"]
+    for item in items:
+        lines.append("|".join(_encode_cell(item.get(col)) for col in columns))
+    return lines
+
+
+def _encode_cell(value) -> str:
+    if value is None:
+        return ""
+    return str(value).replace("\\", "\\\\").replace("|", "\\|").replace("\n", " ")
+
+
 def _resolve_food_price(pred: Dict) -> int:
     if isinstance(pred, dict):
         try:
@@ -418,6 +601,7 @@ def _resolve_food_price(pred: Dict) -> int:
 
 
 def _resolve_accommodation_price(pred: Dict, headcount: int):
+    """Return (room_type, min, max, min_per_person, max_per_person) for an accommodation prediction."""
     room_type = "기본 객실"
     min_p, max_p = DEFAULT_ACCOM_RANGE
 
@@ -441,17 +625,17 @@ def _resolve_accommodation_price(pred: Dict, headcount: int):
                 except (TypeError, ValueError):
                     min_p, max_p = DEFAULT_ACCOM_RANGE
 
-    return room_type, min_p, max_p
+    return room_type, min_p, max_p, min_p // headcount, max_p // headcount
+
+
+# 응답 앞뒤의 ```json / ``` 코드 펜스 (JSON 디코더는 남은 공백을 무시합니다)
+_CODE_FENCE_RE = re.compile(r"^\s*```(?:json)?|```\s*$")
 
 
 def _parse_json_response(text: str) -> dict:
     try:
-        text = text.strip()
-        if text.startswith("```json"): text = text[7:]
-        if text.startswith("```"): text = text[3:]
-        if text.endswith("```"): text = text[:-3]
-        return json.loads(text.strip())
-    except:
+        return json_codec.loads(_CODE_FENCE_RE.sub("", text))
+    except json.JSONDecodeError:  # orjson.JSONDecodeError도 이 하위 클래스입니다
         return {}
 
 
@@ -468,9 +652,30 @@ def _summarize_place(block: PlaceBlockVO) -> str:
         장소에 대해 사용자에게 보여줄 1-2문장 요약을 생성해줘.\n
         JSON만 출력: {{"summary": "요약문"}}
         """
-        resp = gemini_model.generate_content(prompt)
+        resp = gemini_model.generate_content(prompt, request_options={"timeout": settings.gemini_timeout})
         parsed = _parse_json_response(resp.text)
         return parsed.get("summary", "") if isinstance(parsed, dict) else ""
     except Exception as e:
         logger.error(f"Place summary generation failed for {block.placeName}: {e}")
-        return ""
\ No newline at end of file
+        return ""
+
+
+def _summarize_places(blocks: List[PlaceBlockVO]) -> List[str]:
+    """Summarize several places concurrently; results keep the order of ``blocks``.
+
+    각 호출은 네트워크 대기 위주이므로 스레드로 동시에 보내 전체 소요 시간을 가장 느린 한 건 수준으로 줄입니다.
+    """
+    if not gemini_model or not blocks:
+        return ["" for _ in blocks]
+
+    # 전체 보충 시간은 Gemini 호출 한 건의 타임아웃으로 묶고, 끝나지 않은 장소는 빈 요약으로 둡니다.
+    results = ["" for _ in blocks]
+    executor = ThreadPoolExecutor(max_workers=min(8, len(blocks)))
+    try:
+        for k, text in enumerate(executor.map(_summarize_place, blocks, timeout=settings.gemini_timeout)):
+            results[k] = text
+    except FutureTimeoutError:
+        logger.warning("Per-place summary fallback timed out after %ss", settings.gemini_timeout)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
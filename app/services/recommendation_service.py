@@ -1,30 +1,165 @@
+import asyncio
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 import traceback
 import logging
 from fastapi import HTTPException
 
+from app.config import settings
 from app.models import (
     WeatherRecommendationRequest,
     WeatherRecommendationResponse,
     SimpleWeatherInfo,
     WeatherSummary,
 )
+from app.services import json_codec
 from app.services.recommendations import (
+    OutfitStreamInterrupted,
     recommend_outfit_gemini,
     recommend_outfit_rule_based,
+    stream_outfit_gemini,
 )
-from app.services.weather import get_weather_forecast, translate_city_name
+from app.services.weather import get_weather_forecast_range, translate_city_name
 
 # Logger for debug output (use uvicorn.error so it appears in the server logs)
 logger = logging.getLogger("uvicorn.error")
 
-def generate_recommendations(
+
+def _seasonal_summary(temp: int, desc: str) -> Dict[str, Any]:
+    return {
+        "temp": temp, "feels_like": temp, "temp_min": temp,
+        "temp_max": temp, "humidity": 60, "description": desc, "wind_speed": 2,
+    }
+
+
+# 예보를 쓸 수 없는 날(과거/5일 초과)에 사용하는 월별 시즌 평균 날씨 (읽기 전용)
+_SUMMER = _seasonal_summary(28, "더운 여름 날씨")
+_SPRING = _seasonal_summary(18, "따뜻한 봄 날씨")
+_AUTUMN = _seasonal_summary(15, "선선한 가을 날씨")
+_WINTER = _seasonal_summary(5, "추운 겨울 날씨")
+_SEASONAL: Dict[int, Dict[str, Any]] = {
+    1: _WINTER, 2: _WINTER, 3: _SPRING, 4: _SPRING, 5: _SPRING, 6: _SUMMER,
+    7: _SUMMER, 8: _SUMMER, 9: _AUTUMN, 10: _AUTUMN, 11: _AUTUMN, 12: _WINTER,
+}
+
+
+def _fallback_summary(first_day: SimpleWeatherInfo) -> Dict[str, Any]:
+    """규칙 기반 추천에 넘길 첫날 날씨 요약을 만듭니다."""
+    return {
+        "temp": (first_day.temp_min + first_day.temp_max) / 2,
+        "description": first_day.description,
+        "feels_like": first_day.feels_like,
+        "humidity": 60,
+        "wind_speed": 2,
+    }
+
+
+async def _prepare_weather(
+    request: WeatherRecommendationRequest,
+) -> Tuple[str, List[SimpleWeatherInfo], str, int]:
+    """
+    요청 기간을 검증하고 일자별 날씨를 조회합니다.
+    (목적지, 일자별 날씨, Gemini용 날씨 프롬프트, 시즌 평균으로 대체한 날짜 수)를 반환하며
+    잘못된 요청/조회 실패는 HTTPException으로 알립니다.
+    """
+    try:
+        start_date = datetime.fromisoformat(request.start_date)
+        end_date = datetime.fromisoformat(request.end_date)
+    except ValueError as exc:
+        logger.debug("Invalid date format: %s", exc)
+        raise HTTPException(
+            status_code=400,
+            detail=f"잘못된 날짜 형식입니다: {exc}. 'YYYY-MM-DD' 형식을 사용해야 합니다.",
+        )
+
+    duration = (end_date - start_date).days + 1
+    if duration <= 0 or duration > 16:
+        raise HTTPException(
+            status_code=400,
+            detail=f"여행 기간은 1일에서 16일 사이여야 합니다. (요청: {duration}일)",
+        )
+
+    logger.debug("Translating city name: %s", request.city)
+    destination = translate_city_name(request.city)
+    logger.debug("Translated destination: %s", destination)
+
+    daily_weather_list: List[SimpleWeatherInfo] = []
+    seasonal_days = 0  # 시즌 평균으로 대체한 날짜 수
+    prompt_parts: List[str] = [
+        f"여행지: {destination}\n"
+        f"여행 기간: {request.start_date} ~ {request.end_date}\n"
+        "날씨 예보:\n"
+    ]
+
+    # 여행 기간 날씨를 한 번에(과거 날짜는 동시에) 조회한 뒤 날짜별로 꺼내 씁니다. (요약만 사용)
+    forecasts = await asyncio.to_thread(
+        get_weather_forecast_range, destination, start_date, end_date, include_forecasts=False
+    )
+
+    for offset in range(duration):
+        target_date = start_date + timedelta(days=offset)
+        date_str_formatted = target_date.strftime("%Y-%m-%d")
+
+        weather_data = forecasts.get(target_date.date(), {"error": "missing", "alternative": True})
+        logger.debug("Weather data for %s on %s: %s", destination, date_str_formatted, weather_data)
+        weather_summary_data: Optional[Dict[str, Any]] = None
+
+        if "error" in weather_data:
+            # 과거 날짜 또는 대체값 지시가 있는 경우 시즌 평균으로 대체
+            error_msg = str(weather_data.get("error", ""))
+            if weather_data.get("alternative") or "과거" in error_msg or "past" in error_msg.lower():
+                weather_summary_data = _SEASONAL[target_date.month]
+                seasonal_days += 1
+            else:
+                # 기타 오류는 클라이언트에게 명확히 알립니다.
+                logger.debug("Weather API error for %s: %s", date_str_formatted, error_msg)
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"{date_str_formatted} 날씨 정보를 가져올 수 없습니다: {error_msg}",
+                )
+        else:
+            weather_summary_data = weather_data.get("summary")
+
+        if not weather_summary_data:
+            raise HTTPException(
+                status_code=500,
+                detail=f"{date_str_formatted} 날씨 요약 정보가 없습니다.",
+            )
+
+        avg_temp = weather_summary_data.get("temp", 15.0) 
+        simple_weather = SimpleWeatherInfo(
+            date=date_str_formatted,
+            description=weather_summary_data.get("description", "날씨 정보 없음"),
+            temp_min=weather_summary_data.get("temp_min", avg_temp - 3),
+            temp_max=weather_summary_data.get("temp_max", avg_temp + 3),
+            feels_like=weather_summary_data.get("feels_like", avg_temp),
+        )
+
+        daily_weather_list.append(simple_weather)
+
+        prompt_parts.append(
+            f"- {date_str_formatted}: {simple_weather.description}, "
+            f"기온 {simple_weather.temp_min:.1f}°C ~ {simple_weather.temp_max:.1f}°C, "
+            f"체감 {simple_weather.feels_like:.1f}°C\n"
+        )
+
+    full_weather_prompt = "".join(prompt_parts)
+
+    return destination, daily_weather_list, full_weather_prompt, seasonal_days
+
+
+def _should_skip_gemini(daily_weather_list: List[SimpleWeatherInfo], seasonal_days: int) -> bool:
+    # 실제 예보가 하나도 없으면 Gemini 추천의 이점이 작으므로 호출을 생략합니다.
+    return settings.skip_gemini_on_full_fallback and seasonal_days == len(daily_weather_list)
+
+
+async def generate_recommendations(
     request: WeatherRecommendationRequest,
 ) -> WeatherRecommendationResponse:
     """
     여행 도시, 시작일, 종료일을 받아 일자별 날씨와
     종합 옷차림 추천을 JSON으로 반환합니다. (routes.py에서 분리된 비즈니스 로직)
+    블로킹 외부 호출(날씨, Gemini)은 워커 스레드에서 실행해 이벤트 루프를 막지 않습니다.
     """
     try:
         # DEBUG: 요청 내용 로깅
@@ -34,111 +169,25 @@ def generate_recommendations(
             # 안전하게 request를 문자열로 출력
             logger.debug("DEBUG: generate_recommendations request (repr): %r", request)
 
-        try:
-            start_date = datetime.fromisoformat(request.start_date)
-            end_date = datetime.fromisoformat(request.end_date)
-        except ValueError as exc:
-            logger.debug("Invalid date format: %s", exc)
-            raise HTTPException(
-                status_code=400,
-                detail=f"잘못된 날짜 형식입니다: {exc}. 'YYYY-MM-DD' 형식을 사용해야 합니다.",
-            )
-
-        duration = (end_date - start_date).days + 1
-        if duration <= 0 or duration > 16:
-            raise HTTPException(
-                status_code=400,
-                detail=f"여행 기간은 1일에서 16일 사이여야 합니다. (요청: {duration}일)",
-            )
-
-        logger.debug("Translating city name: %s", request.city)
-        destination = translate_city_name(request.city)
-        logger.debug("Translated destination: %s", destination)
-        
-        daily_weather_list: List[SimpleWeatherInfo] = []
-        full_weather_prompt = (
-            f"여행지: {destination}\n"
-            f"여행 기간: {request.start_date} ~ {request.end_date}\n"
-            "날씨 예보:\n"
-        )
-        
-        for offset in range(duration):
-            target_date = start_date + timedelta(days=offset)
-            date_str_formatted = target_date.strftime("%Y-%m-%d")
-
-            weather_data = get_weather_forecast(destination, target_date)
-            logger.debug("Weather data for %s on %s: %s", destination, date_str_formatted, weather_data)
-            weather_summary_data: Optional[Dict[str, Any]] = None
-
-            if "error" in weather_data:
-                # 과거 날짜 또는 대체값 지시가 있는 경우 시즌 평균으로 대체
-                error_msg = str(weather_data.get("error", ""))
-                if weather_data.get("alternative") or "과거" in error_msg or "past" in error_msg.lower():
-                    month = target_date.month
-                    if month in [6, 7, 8]: temp, desc = 28, "더운 여름 날씨"
-                    elif month in [3, 4, 5]: temp, desc = 18, "따뜻한 봄 날씨"
-                    elif month in [9, 10, 11]: temp, desc = 15, "선선한 가을 날씨"
-                    else: temp, desc = 5, "추운 겨울 날씨"
-                    
-                    weather_summary_data = {
-                        "temp": temp, "feels_like": temp, "temp_min": temp,
-                        "temp_max": temp, "humidity": 60, "description": desc, "wind_speed": 2,
-                    }
-                else:
-                    # 기타 오류는 클라이언트에게 명확히 알립니다.
-                    logger.debug("Weather API error for %s: %s", date_str_formatted, error_msg)
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"{date_str_formatted} 날씨 정보를 가져올 수 없습니다: {error_msg}",
-                    )
-            else:
-                weather_summary_data = weather_data.get("summary")
-
-            if not weather_summary_data:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"{date_str_formatted} 날씨 요약 정보가 없습니다.",
-                )
-            
-            avg_temp = weather_summary_data.get("temp", 15.0) 
-            simple_weather = SimpleWeatherInfo(
-                date=date_str_formatted,
-                description=weather_summary_data.get("description", "날씨 정보 없음"),
-                temp_min=weather_summary_data.get("temp_min", avg_temp - 3),
-                temp_max=weather_summary_data.get("temp_max", avg_temp + 3),
-                feels_like=weather_summary_data.get("feels_like", avg_temp),
-            )
-            
-            daily_weather_list.append(simple_weather)
-            
-            full_weather_prompt += (
-                f"- {date_str_formatted}: {simple_weather.description}, "
-                f"기온 {simple_weather.temp_min:.1f}°C ~ {simple_weather.temp_max:.1f}°C, "
-                f"체감 {simple_weather.feels_like:.1f}°C\n"
-            )
+        destination, daily_weather_list, full_weather_prompt, seasonal_days = await _prepare_weather(request)
 
         final_recommendation: Optional[str] = None
         try:
-            # Gemini 호출
-            logger.debug("Calling Gemini recommend_outfit_gemini (prompt length=%d)", len(full_weather_prompt))
-            final_recommendation = recommend_outfit_gemini(
-                full_weather_prompt,
-                destination,
-                f"{request.start_date} ~ {request.end_date}",
-            )
-            logger.debug("Gemini returned (truncated): %s", (final_recommendation[:500] if final_recommendation else None))
+            if _should_skip_gemini(daily_weather_list, seasonal_days):
+                logger.debug("All %d days use seasonal fallback weather; skipping Gemini", seasonal_days)
+            else:
+                # Gemini 호출
+                logger.debug("Calling Gemini recommend_outfit_gemini (prompt length=%d)", len(full_weather_prompt))
+                final_recommendation = await recommend_outfit_gemini(
+                    full_weather_prompt,
+                    destination,
+                    f"{request.start_date} ~ {request.end_date}",
+                )
+                logger.debug("Gemini returned (truncated): %s", (final_recommendation[:500] if final_recommendation else None))
 
-            # Gemini 실패 시 규칙 기반 대체
+            # Gemini 실패(또는 생략) 시 규칙 기반 대체
             if not final_recommendation:
-                first_day_weather = daily_weather_list[0]
-                fallback_summary = {
-                    "temp": (first_day_weather.temp_min + first_day_weather.temp_max) / 2,
-                    "description": first_day_weather.description,
-                    "feels_like": first_day_weather.feels_like,
-                    "humidity": 60, 
-                    "wind_speed": 2,
-                }
-                final_recommendation = recommend_outfit_rule_based(fallback_summary)
+                final_recommendation = recommend_outfit_rule_based(_fallback_summary(daily_weather_list[0]))
 
         except Exception as e:
             logger.exception("!!! AI 추천 생성 중 오류 발생: %s", e)
@@ -146,14 +195,7 @@ def generate_recommendations(
             # 2차 Fallback (규칙 기반) 시도
             try:
                 if daily_weather_list:
-                    first_day_weather = daily_weather_list[0]
-                    fallback_summary = {
-                        "temp": (first_day_weather.temp_min + first_day_weather.temp_max) / 2,
-                        "description": first_day_weather.description,
-                        "feels_like": first_day_weather.feels_like,
-                        "humidity": 60,
-                        "wind_speed": 2,
-                    }
+                    fallback_summary = _fallback_summary(daily_weather_list[0])
                     logger.debug("Calling rule-based fallback with summary: %s", fallback_summary)
                     final_recommendation = recommend_outfit_rule_based(fallback_summary)
                 else:
@@ -180,4 +222,70 @@ def generate_recommendations(
         raise HTTPException(
             status_code=500,
             detail=f"서버 내부 오류 발생: {e}",
-        )
\ No newline at end of file
+        )
+
+async def stream_recommendations(
+    request: WeatherRecommendationRequest,
+) -> AsyncIterator[str]:
+    """
+    generate_recommendations의 SSE(text/event-stream) 버전.
+    날씨 조회/검증은 스트림을 열기 전에 끝내므로 잘못된 요청은 일반 JSON 오류로 응답되고,
+    반환된 제너레이터는 weather 이벤트(일자별 날씨 JSON) 다음에 추천문을 생성되는 대로
+    recommendation 이벤트로 보내고 done 이벤트로 끝납니다.
+    """
+    try:
+        destination, daily_weather_list, full_weather_prompt, seasonal_days = await _prepare_weather(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("!!! FATAL ERROR in stream_recommendations: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail=f"서버 내부 오류 발생: {e}",
+        )
+
+    return _recommendation_events(
+        daily_weather_list,
+        full_weather_prompt,
+        destination,
+        f"{request.start_date} ~ {request.end_date}",
+        _should_skip_gemini(daily_weather_list, seasonal_days),
+    )
+
+
+async def _recommendation_events(
+    daily_weather_list: List[SimpleWeatherInfo],
+    full_weather_prompt: str,
+    destination: str,
+    date_range: str,
+    skip_gemini: bool,
+) -> AsyncIterator[str]:
+    yield _sse_event("weather", json_codec.dumps([w.model_dump() for w in daily_weather_list]))
+
+    streamed = False
+    if not skip_gemini:
+        try:
+            async for chunk in stream_outfit_gemini(full_weather_prompt, destination, date_range):
+                streamed = True
+                yield _sse_event("recommendation", chunk)
+        except OutfitStreamInterrupted as exc:
+            # 이미 일부를 보냈으므로 done 대신 error로 불완전한 응답임을 알립니다.
+            yield _sse_event("error", f"추천 생성이 중간에 중단되었습니다 ({exc}).")
+            return
+
+    # Gemini 실패(또는 생략) 시 규칙 기반 대체
+    if not streamed:
+        try:
+            fallback = recommend_outfit_rule_based(_fallback_summary(daily_weather_list[0]))
+        except Exception as e:
+            logger.exception("!!! 규칙 기반 추천 실패: %s", e)
+            fallback = "날씨 정보가 복잡하여 AI 추천 생성에 실패했습니다. 기본 옷차림을 준비해주세요."
+        yield _sse_event("recommendation", fallback)
+
+    yield _sse_event("done", "")
+
+
+def _sse_event(event: str, data: str) -> str:
+    # 여러 줄 데이터는 줄마다 "data:" 필드로 보내야 클라이언트가 줄바꿈을 복원합니다.
+    lines = "".join(f"data: {line}\n" for line in data.split("\n"))
+    return f"event: {event}\n{lines}\n"
@@ -1,24 +1,30 @@
 """Outfit recommendation helpers."""
 
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import hashlib
+from bisect import bisect_right
 import logging
 
+from app.config import settings
+from app.services.cache import TTLCache
 from app.services.gemini import gemini_model
 
 # logger
 logger = logging.getLogger("uvicorn.error")
 
+# 같은 프롬프트(도시·기간·예보가 같은 요청)에 대한 Gemini 응답 캐시 (키: 프롬프트 sha256)
+# 실패(None)도 짧게 기억해 장애 중인 API를 요청마다 다시 두드리지 않도록 합니다.
+OUTFIT_CACHE_MAXSIZE = 4096
+OUTFIT_CACHE_TTL_SECONDS = 6 * 60 * 60
+OUTFIT_NEGATIVE_CACHE_TTL_SECONDS = 60
 
-# --- [수정] ---
-# 함수가 weather_summary (Dict) 대신 full_weather_prompt (str)를 받도록 수정합니다.
-def recommend_outfit_gemini(full_weather_prompt: str, destination: str, date_str: str) -> Optional[str]:
-    """Generate a recommendation using Gemini when available."""
-    if gemini_model is None:
-        return None
+_outfit_cache = TTLCache(maxsize=OUTFIT_CACHE_MAXSIZE, ttl=OUTFIT_CACHE_TTL_SECONDS)
+_MISSING = object()
 
-    # [수정] 프롬프트가 전달받은 날씨 요약 문자열을 그대로 사용하도록 변경
-    prompt = f"""
-당신은 여행 패션 전문가입니다. 다음 여행 정보를 바탕으로 적절한 옷차림을 "종합적"으로 추천해주세요.
+
+# Gemini 옷차림 추천 프롬프트 (모듈 로드 시 한 번만 만들어 두고 호출마다 format)
+_PROMPT_TMPL = """당신은 여행 패션 전문가입니다. 다음 여행 정보를 바탕으로 적절한 옷차림을 "종합적"으로 추천해주세요.
 
 📍 여행 정보:
 {full_weather_prompt}
@@ -31,26 +37,152 @@ def recommend_outfit_gemini(full_weather_prompt: str, destination: str, date_str
 5. 필수 준비물 (예: 우산, 선크림, 핫팩)
 
 답변은 친근하고 실용적인 한국어 어조로 작성해주세요.
-**매우 중요: 답변에 마크다운 강조문(`**`, `##`)을 절대 사용하지 말고, 답변해주세요.**
-""".strip()
+**매우 중요: 답변에 마크다운 강조문(`**`, `##`)을 절대 사용하지 말고, 답변해주세요.**"""
+
+
+# --- [수정] ---
+# 함수가 weather_summary (Dict) 대신 full_weather_prompt (str)를 받도록 수정합니다.
+async def recommend_outfit_gemini(full_weather_prompt: str, destination: str, date_str: str) -> Optional[str]:
+    """Generate a recommendation using Gemini when available.
+
+    settings.gemini_timeout 안에 응답이 없으면 None을 반환해 호출 측이 규칙 기반 추천으로 대체하게 합니다.
+    """
+    if gemini_model is None:
+        return None
+
+    # [수정] 프롬프트가 전달받은 날씨 요약 문자열을 그대로 사용하도록 변경
+    prompt = _PROMPT_TMPL.format(full_weather_prompt=full_weather_prompt)
     
+    cache_key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    cached = _outfit_cache.get(cache_key, _MISSING)
+    if cached is not _MISSING:
+        logger.debug("Gemini outfit cache hit (%s)", "negative" if cached is None else "positive")
+        return cached
+
     try:
         logger.debug("Sending prompt to Gemini (truncated): %s", prompt[:400])
-        response = gemini_model.generate_content(prompt)
+        response = await asyncio.wait_for(
+            gemini_model.generate_content_async(prompt),
+            timeout=settings.gemini_timeout,
+        )
         try:
             resp_text = getattr(response, "text", None)
         except Exception:
             # fallback representation
             resp_text = str(response)
         logger.debug("Gemini raw response (truncated): %s", (resp_text[:500] if resp_text else None))
-        return resp_text
+    except asyncio.TimeoutError:
+        logger.warning("Gemini 응답이 %.1f초 안에 오지 않아 대체 추천을 사용합니다.", settings.gemini_timeout)
+        resp_text = None
     except Exception as exc:  # pragma: no cover - external API call
         # 이 print 문이 Anaconda 로그에 보여야 합니다.
         logger.exception("!!! Gemini API 오류 발생: %s", exc)
-        return None
+        resp_text = None
+
+    _remember_outfit(cache_key, resp_text)
+    return resp_text
 # --- [수정 완료] ---
 
 
+class OutfitStreamInterrupted(Exception):
+    """Raised when a Gemini stream stops after some text was already yielded."""
+
+
+async def stream_outfit_gemini(full_weather_prompt: str, destination: str, date_str: str) -> AsyncIterator[str]:
+    """Streaming variant of recommend_outfit_gemini that yields text chunks as Gemini produces them.
+
+    settings.gemini_timeout은 전체 응답 시간이 아니라 첫 조각까지, 그리고 조각 사이의 대기 시간에 적용합니다.
+    아무것도 받기 전에 미설정·오류·시간 초과가 나면 조각 없이 끝나므로 호출 측이 규칙 기반 추천으로 대체하고,
+    일부를 보낸 뒤 끊기면 OutfitStreamInterrupted를 발생시켜 호출 측이 불완전한 응답임을 알릴 수 있게 합니다.
+    """
+    if gemini_model is None:
+        return
+
+    prompt = _PROMPT_TMPL.format(full_weather_prompt=full_weather_prompt)
+    cache_key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    cached = _outfit_cache.get(cache_key, _MISSING)
+    if cached is not _MISSING:
+        logger.debug("Gemini outfit cache hit (%s)", "negative" if cached is None else "positive")
+        if cached:
+            yield cached
+        return
+
+    loop = asyncio.get_running_loop()
+    # 첫 조각까지의 기한 (조각을 받을 때마다 다시 gemini_timeout 만큼 연장)
+    deadline = loop.time() + settings.gemini_timeout
+    parts: List[str] = []
+    chunks = None
+    failure: Optional[str] = None
+    try:
+        logger.debug("Streaming prompt to Gemini (truncated): %s", prompt[:400])
+        response = await asyncio.wait_for(
+            gemini_model.generate_content_async(prompt, stream=True),
+            timeout=max(deadline - loop.time(), 0),
+        )
+        chunks = response.__aiter__()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), timeout=max(deadline - loop.time(), 0))
+            except StopAsyncIteration:
+                break
+            deadline = loop.time() + settings.gemini_timeout
+            try:
+                text = chunk.text
+            except ValueError:
+                # 텍스트 파트가 없는 조각 (예: 안전 필터 메타데이터만 담긴 경우)
+                continue
+            if text:
+                parts.append(text)
+                yield text
+    except asyncio.TimeoutError:
+        logger.warning("Gemini 스트리밍 응답이 %.1f초 동안 멈췄습니다.", settings.gemini_timeout)
+        failure = "timeout"
+    except Exception as exc:  # pragma: no cover - external API call
+        logger.exception("!!! Gemini 스트리밍 오류 발생: %s", exc)
+        failure = "error"
+    finally:
+        # 중간에 그만 읽은 스트림은 닫아서 연결을 정리합니다.
+        aclose = getattr(chunks, "aclose", None)
+        if failure and aclose is not None:
+            try:
+                await aclose()
+            except Exception:  # pragma: no cover - best-effort cleanup
+                pass
+
+    if failure is None:
+        _remember_outfit(cache_key, "".join(parts))
+    elif not parts:
+        _remember_outfit(cache_key, None)
+    else:
+        # 끊긴 응답은 캐시하지 않습니다.
+        raise OutfitStreamInterrupted(failure)
+
+
+def _remember_outfit(cache_key: str, resp_text: Optional[str]) -> None:
+    if resp_text:
+        _outfit_cache.set(cache_key, resp_text)
+    else:
+        _outfit_cache.set(cache_key, None, ttl=OUTFIT_NEGATIVE_CACHE_TTL_SECONDS)
+
+
+# 규칙 기반 추천 테이블: _TEMP_THRESHOLDS[i] 이상이면 _TEMP_BUCKETS[i + 1], 5도 미만이면 _TEMP_BUCKETS[0]
+# (bisect 한 번으로 구간을 찾습니다)
+_TEMP_THRESHOLDS = (5, 12, 17, 20, 23, 28)
+_TEMP_BUCKETS = (
+    ("패딩과 방한 장비", ("두꺼운 목도리", "방한 장갑", "방한 모자", "핫팩"), "매우 추운 날씨입니다. 여러 겹 레이어드로 입으세요!"),
+    ("두꺼운 코트와 기모 옷", ("목도리", "장갑", "방한 모자"), "추운 날씨입니다. 방한 준비를 철저히 하세요."),
+    ("니트나 맨투맨에 자켓", ("목도리", "바람막이"), "쌀쌀한 날씨입니다. 따뜻하게 입으세요."),
+    ("긴팔 셔츠에 가디건 또는 자켓", ("스카프", "편한 운동화"), "약간 쌀쌀합니다. 겉옷을 꼭 챙기세요."),
+    ("긴팔 티셔츠, 얇은 니트", ("가벼운 재킷", "편한 신발"), "선선한 날씨입니다. 활동하기 좋은 온도예요!"),
+    ("반팔 티셔츠와 청바지, 면 소재 옷", ("얇은 가디건", "선글라스", "모자"), "쾌적한 날씨입니다. 일교차에 대비해 얇은 겉옷을 준비하세요."),
+    ("반팔 티셔츠와 반바지 또는 린넨 소재의 가벼운 옷", ("선글라스", "모자", "선크림", "물병"), "매우 더운 날씨입니다. 수분 섭취에 유의하세요!"),
+)
+_RAIN_KEYWORDS = ("비", "rain")
+_SNOW_KEYWORDS = ("눈", "snow")
+_RAIN_ITEMS = ("우산", "방수 재킷", "방수 신발")
+_SNOW_ITEMS = ("방수 부츠", "미끄럼 방지 신발")
+
+
 def recommend_outfit_rule_based(weather_summary: Dict[str, Any]) -> str:
     """Fallback rule-based recommendation."""
     
@@ -60,53 +192,26 @@ def recommend_outfit_rule_based(weather_summary: Dict[str, Any]) -> str:
     desc = weather_summary.get("description", "")
     humidity = weather_summary.get("humidity", 60)
 
-    recommendation = {"outfit": "", "items": [], "advice": ""}
-
-    if temp >= 28:
-        recommendation["outfit"] = "반팔 티셔츠와 반바지 또는 린넨 소재의 가벼운 옷"
-        recommendation["items"] = ["선글라스", "모자", "선크림", "물병"]
-        recommendation["advice"] = "매우 더운 날씨입니다. 수분 섭취에 유의하세요!"
-    elif temp >= 23:
-        recommendation["outfit"] = "반팔 티셔츠와 청바지, 면 소재 옷"
-        recommendation["items"] = ["얇은 가디건", "선글라스", "모자"]
-        recommendation["advice"] = "쾌적한 날씨입니다. 일교차에 대비해 얇은 겉옷을 준비하세요."
-    elif temp >= 20:
-        recommendation["outfit"] = "긴팔 티셔츠, 얇은 니트"
-        recommendation["items"] = ["가벼운 재킷", "편한 신발"]
-        recommendation["advice"] = "선선한 날씨입니다. 활동하기 좋은 온도예요!"
-    elif temp >= 17:
-        recommendation["outfit"] = "긴팔 셔츠에 가디건 또는 자켓"
-        recommendation["items"] = ["스카프", "편한 운동화"]
-        recommendation["advice"] = "약간 쌀쌀합니다. 겉옷을 꼭 챙기세요."
-    elif temp >= 12:
-        recommendation["outfit"] = "니트나 맨투맨에 자켓"
-        recommendation["items"] = ["목도리", "바람막이"]
-        recommendation["advice"] = "쌀쌀한 날씨입니다. 따뜻하게 입으세요."
-    elif temp >= 5:
-        recommendation["outfit"] = "두꺼운 코트와 기모 옷"
-        recommendation["items"] = ["목도리", "장갑", "방한 모자"]
-        recommendation["advice"] = "추운 날씨입니다. 방한 준비를 철저히 하세요."
-    else:
-        recommendation["outfit"] = "패딩과 방한 장비"
-        recommendation["items"] = ["두꺼운 목도리", "방한 장갑", "방한 모자", "핫팩"]
-        recommendation["advice"] = "매우 추운 날씨입니다. 여러 겹 레이어드로 입으세요!"
-
-    if "비" in desc or "rain" in desc.lower():
-        recommendation["items"].extend(["우산", "방수 재킷", "방수 신발"])
-        recommendation["advice"] += " 비가 예상되니 우산과 방수 용품을 준비하세요."
-    if "눈" in desc or "snow" in desc.lower():
-        recommendation["items"].extend(["방수 부츠", "미끄럼 방지 신발"])
-        recommendation["advice"] += " 눈이 예상되니 미끄럼 방지 신발을 신으세요."
-    if humidity >= 80:
-        recommendation["advice"] += " 습도가 높으니 통풍이 잘 되는 옷을 입으세요."
-
-    return f"""
-👔 추천 옷차림:
-{recommendation['outfit']}
+    outfit, base_items, advice = _TEMP_BUCKETS[bisect_right(_TEMP_THRESHOLDS, temp)]
+    items = list(base_items)
 
-🎒 필수 준비물:
-{', '.join(recommendation['items'])}
-
-💡 여행 팁:
-{recommendation['advice']}
-""".strip()
+    desc_lower = desc.lower()
+    if any(k in desc_lower for k in _RAIN_KEYWORDS):
+        items.extend(_RAIN_ITEMS)
+        advice += " 비가 예상되니 우산과 방수 용품을 준비하세요."
+    if any(k in desc_lower for k in _SNOW_KEYWORDS):
+        items.extend(_SNOW_ITEMS)
+        advice += " 눈이 예상되니 미끄럼 방지 신발을 신으세요."
+    if humidity >= 80:
+        advice += " 습도가 높으니 통풍이 잘 되는 옷을 입으세요."
+
+    return "\n".join((
+        "👔 추천 옷차림:",
+        outfit,
+        "",
+        "🎒 필수 준비물:",
+        ", ".join(items),
+        "",
+        "💡 여행 팁:",
+        advice,
+    ))
@@ -1,16 +1,48 @@
 # app/services/search_service.py
 
-from datetime import datetime, time, timedelta, date as date_type
+import re
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from datetime import time
+from functools import lru_cache
+from itertools import accumulate
 from typing import List, Dict, Any, Tuple, Optional
 
-import requests
-
 from app.config import settings
+from app.services import json_codec
+from app.services.cache import TTLCache
+from app.services.http_client import build_session
 
 
 DAY_START = time(9, 0, 0)
 DAY_END = time(20, 0, 0)
 
+# 시간 구간 계산은 자정 기준 분(int)으로 합니다.
+DAY_START_MIN = DAY_START.hour * 60 + DAY_START.minute
+DAY_END_MIN = DAY_END.hour * 60 + DAY_END.minute
+
+# 빈 구간을 못 찾았을 때 쓰는 기본 배치 (19:00 ~ 20:30)
+FALLBACK_START_MIN = 19 * 60
+FALLBACK_DURATION_MIN = 90
+
+# search_multiple_place_blocks 에서 동시에 보내는 Places 요청 수 상한 (API 할당량 보호)
+PLACES_MAX_CONCURRENCY = 8
+
+# Google Places 호출용 커넥션 풀 (동시 검색 수보다 넉넉하게)
+_SESSION = build_session(pool_maxsize=PLACES_MAX_CONCURRENCY * 2)
+
+# 배치 검색용 스레드 풀 (요청마다 스레드를 새로 만들지 않도록 프로세스 전체에서 공유)
+_PLACES_EXECUTOR = ThreadPoolExecutor(max_workers=PLACES_MAX_CONCURRENCY, thread_name_prefix="places-search")
+
+# Google Places 검색 결과 캐시 (키: 정규화한 쿼리, 소수 셋째 자리로 반올림한 위치, 반경)
+# Google ToS의 30일 보관 한도보다 충분히 짧은 48시간만 보관합니다.
+PLACES_CACHE_MAXSIZE = 10_000
+PLACES_CACHE_TTL_SECONDS = 48 * 60 * 60
+_places_cache = TTLCache(maxsize=PLACES_CACHE_MAXSIZE, ttl=PLACES_CACHE_TTL_SECONDS)
+
+# 목적지 이름 -> "lat,lng" 캐시 (실패는 저장하지 않음)
+_destination_cache = TTLCache(maxsize=1024, ttl=PLACES_CACHE_TTL_SECONDS)
+
 # 자동 일정 생성 시간대 정의
 AUTO_SCHEDULE_TIMES = {
     "morning": {"start": time(9, 0, 0), "end": time(10, 0, 0), "type": "맛집"},
@@ -43,6 +75,11 @@ def get_destination_location(destination: str) -> Optional[str]:
     if not destination:
         return None
 
+    cache_key = _normalize_name(destination)
+    cached = _destination_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         # Google Places API Text Search로 목적지 검색
         url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
@@ -52,15 +89,17 @@ def get_destination_location(destination: str) -> Optional[str]:
             "language": "ko",
         }
 
-        r = requests.get(url, params=params, timeout=5)
-        data = r.json()
+        r = _SESSION.get(url, params=params, timeout=5)
+        data = json_codec.loads(r.content)
 
         if data.get("status") == "OK" and data.get("results"):
             result = data["results"][0]
             lat = result["geometry"]["location"]["lat"]
             lng = result["geometry"]["location"]["lng"]
             print(f"[LOCATION] 목적지 '{destination}' 위치: {lat},{lng}")
-            return f"{lat},{lng}"
+            location = f"{lat},{lng}"
+            _destination_cache.set(cache_key, location)
+            return location
 
     except Exception as e:
         print(f"[ERROR] 목적지 위치 검색 실패: {e}")
@@ -68,36 +107,49 @@ def get_destination_location(destination: str) -> Optional[str]:
     return None
 
 
-def get_location_from_plan(planContext: dict, timeTableId: int) -> Optional[str]:
+def _index_plan_locations(blocks: List[Dict[str, Any]]) -> Tuple[Dict[Any, str], Optional[str]]:
+    """
+    블록 목록을 한 번 훑어 timeTableId 별 첫 위치와 전체 블록 중 첫 위치를 "lat,lng" 로 모은다.
+    """
+    by_timetable: Dict[Any, str] = {}
+    first_location: Optional[str] = None
+    for block in blocks:
+        y_loc = block.get("yLocation")
+        x_loc = block.get("xLocation")
+        if y_loc is None or x_loc is None:
+            continue
+        location = f"{y_loc},{x_loc}"
+        by_timetable.setdefault(block.get("timeTableId"), location)
+        if first_location is None:
+            first_location = location
+    return by_timetable, first_location
+
+
+def get_location_from_plan(
+    planContext: dict,
+    timeTableId: int,
+    location_index: Optional[Tuple[Dict[Any, str], Optional[str]]] = None,
+) -> Optional[str]:
     """
     planContext에서 해당 timeTableId의 기존 장소 블록 중 하나의 위치를 가져온다.
     같은 날짜(timeTableId)의 장소들이 여러 개 있을 경우 첫 번째 장소의 위치를 반환.
     없으면 전체 블록 중 첫 번째 장소의 위치를 반환.
     그마저도 없으면 TravelName(목적지)으로 위치를 검색합니다.
 
+    Args:
+        location_index: 호출자가 _index_plan_locations로 미리 만든 인덱스 (없으면 여기서 한 번 만든다)
+
     Returns:
         "latitude,longitude" 형식의 문자열 또는 None
     """
-    blocks = parse_blocks_from_plan(planContext)
-
-    # 1. 같은 timeTableId의 블록 찾기
-    if blocks:
-        same_day_blocks = [b for b in blocks if b.get("timeTableId") == timeTableId]
-
-        # 2. 같은 날짜의 블록이 있으면 그 중 첫 번째 위치 사용
-        if same_day_blocks:
-            for block in same_day_blocks:
-                y_loc = block.get("yLocation")
-                x_loc = block.get("xLocation")
-                if y_loc is not None and x_loc is not None:
-                    return f"{y_loc},{x_loc}"
+    if location_index is None:
+        location_index = _index_plan_locations(parse_blocks_from_plan(planContext))
 
-        # 3. 같은 날짜의 블록이 없으면 전체 블록 중 첫 번째 위치 사용 (여행지 근처일 가능성 높음)
-        for block in blocks:
-            y_loc = block.get("yLocation")
-            x_loc = block.get("xLocation")
-            if y_loc is not None and x_loc is not None:
-                return f"{y_loc},{x_loc}"
+    # 1~3. 같은 timeTableId 블록의 첫 위치, 없으면 전체 블록 중 첫 위치 (여행지 근처일 가능성 높음)
+    by_timetable, first_location = location_index
+    location = by_timetable.get(timeTableId, first_location)
+    if location is not None:
+        return location
 
     # 4. 블록이 하나도 없으면 TravelName(목적지)으로 위치 검색
     travel_name = planContext.get("TravelName")
@@ -108,6 +160,38 @@ def get_location_from_plan(planContext: dict, timeTableId: int) -> Optional[str]
     return None
 
 
+# "HH:MM:SS" / "HH:MM" (strptime과 같이 한 자리 시/분/초도 허용)
+_TIME_RE = re.compile(r"(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?")
+
+
+def _parse_time_list(t: list) -> time:
+    if len(t) == 2:
+        # [시, 분]
+        return time(hour=t[0], minute=t[1], second=0)
+    if len(t) >= 3:
+        # [시, 분, 초] 또는 [시, 분, 초, 나노초] - 나노초는 무시
+        return time(hour=t[0], minute=t[1], second=t[2])
+    raise ValueError(f"Invalid time array format: {t}")
+
+
+# 같은 시간 문자열("09:00:00" 등)이 요청 간에 반복되므로 결과(불변 time)를 캐시합니다.
+# 리스트 입력은 해시할 수 없고 매번 새 객체라 캐시하지 않습니다.
+@lru_cache(maxsize=1024)
+def _parse_time_str(t: str) -> time:
+    m = _TIME_RE.fullmatch(t)
+    if m is None:
+        _raise_unparseable_time(t)
+    return time(int(m[1]), int(m[2]), int(m[3] or 0))
+
+
+def _raise_unparseable_time(t):
+    raise ValueError(f"Unable to parse time value: '{t}' (type: {type(t)}). Expected format: 'HH:MM:SS', 'HH:MM', or [HH, MM]")
+
+
+# 입력 타입별 파서 (배열/리스트는 Jackson LocalTime 직렬화 형식)
+_TIME_PARSERS = {list: _parse_time_list, str: _parse_time_str}
+
+
 def _parse_time(t) -> time:
     """
     다양한 시간 포맷을 파싱합니다.
@@ -119,97 +203,147 @@ def _parse_time(t) -> time:
     if not t:
         raise ValueError("Time value is empty")
 
-    # 배열/리스트 형식인 경우 (Jackson LocalTime 직렬화)
-    if isinstance(t, list):
-        if len(t) == 2:
-            # [시, 분]
-            return time(hour=t[0], minute=t[1], second=0)
-        elif len(t) == 3:
-            # [시, 분, 초]
-            return time(hour=t[0], minute=t[1], second=t[2])
-        elif len(t) >= 4:
-            # [시, 분, 초, 나노초] - 나노초는 무시
-            return time(hour=t[0], minute=t[1], second=t[2])
-        else:
-            raise ValueError(f"Invalid time array format: {t}")
-
-    # 문자열 형식인 경우
-    if isinstance(t, str):
-        # "HH:MM:SS" 형식 시도
-        try:
-            return datetime.strptime(t, "%H:%M:%S").time()
-        except ValueError:
-            pass
-
-        # "HH:MM" 형식 시도
-        try:
-            return datetime.strptime(t, "%H:%M").time()
-        except ValueError:
-            pass
-
-    # 모두 실패하면 에러 메시지와 함께 예외 발생
-    raise ValueError(f"Unable to parse time value: '{t}' (type: {type(t)}). Expected format: 'HH:MM:SS', 'HH:MM', or [HH, MM]")
+    return _TIME_PARSERS.get(type(t), _raise_unparseable_time)(t)
+
+
+def time_of_day_seconds(t) -> int:
+    """
+    _parse_time이 받는 시간 값(문자열/배열/time)을 자정 기준 초(int)로 변환합니다.
+    시간 비교는 time/datetime 객체 대신 이 정수로 합니다.
+    """
+    parsed = t if isinstance(t, time) else _parse_time(t)
+    return parsed.hour * 3600 + parsed.minute * 60 + parsed.second
+
+
+def _to_minutes(t, round_up: bool = False) -> int:
+    """
+    _parse_time이 받는 시간 값을 자정 기준 분으로 변환합니다.
+    round_up=True면 남는 초를 다음 분으로 올립니다 (구간 끝을 보수적으로 잡을 때 사용).
+    """
+    minutes, seconds = divmod(time_of_day_seconds(t), 60)
+    if round_up and seconds:
+        minutes += 1
+    return minutes
+
+
+def _format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}:00"
 
 
-def _format_time(t: time) -> str:
-    return t.strftime("%H:%M:%S")
+def _build_sorted_used_intervals(existing_blocks: List[Dict[str, Any]], timeTableId: int) -> List[Tuple[int, int]]:
+    """
+    해당 timeTableId 의 블록만 골라 시작분 기준으로 정렬한 (시작분, 끝분) 구간 리스트를 만든다.
+    한 요청 안에서 한 번만 만들어 두고 빈 구간 탐색에 재사용한다.
+    """
+    return sorted(
+        (_to_minutes(b["blockStartTime"]), _to_minutes(b["blockEndTime"], round_up=True))
+        for b in existing_blocks
+        if b.get("timeTableId") == timeTableId
+    )
 
 
 def find_non_overlapping_time(
     existing_blocks: List[Dict[str, Any]],
     timeTableId: int,
     duration_minutes: int = 90,
+    used: Optional[List[Tuple[int, int]]] = None,
 ) -> Tuple[str, str]:
     """
     같은 timeTableId 내에서 겹치지 않는 시간 구간을 찾는다.
     - 기존 블록들의 시간과 겹치지 않는 첫 구간을 리턴.
     - 못 찾으면 DAY_START 기준으로 쭉 뒤로 밀어서 배치.
+    - used 로 _build_sorted_used_intervals 결과를 넘기면 existing_blocks 를 다시 파싱하지 않는다.
     """
+    if used is None:
+        used = _build_sorted_used_intervals(existing_blocks, timeTableId)
 
-    duration = timedelta(minutes=duration_minutes)
-    today = datetime.today().date()
+    slot = _find_slot(used, duration_minutes, DAY_START_MIN, DAY_END_MIN)
+    if slot is not None:
+        return _format_minutes(slot), _format_minutes(slot + duration_minutes)
+
+    # 실패시 그냥 fallback
+    return _format_minutes(FALLBACK_START_MIN), _format_minutes(FALLBACK_START_MIN + FALLBACK_DURATION_MIN)
 
-    # 해당 timeTableId 의 블록만 필터링해서 datetime 구간으로 변환
-    used: List[Tuple[datetime, datetime]] = []
-    for b in existing_blocks:
-        if b.get("timeTableId") != timeTableId:
-            continue
 
-        start_dt = datetime.combine(today, _parse_time(b["blockStartTime"]))
-        end_dt = datetime.combine(today, _parse_time(b["blockEndTime"]))
-        used.append((start_dt, end_dt))
+def _find_slot(
+    used: List[Tuple[int, int]],
+    duration: int,
+    day_start: int = DAY_START_MIN,
+    day_end: int = DAY_END_MIN,
+) -> Optional[int]:
+    """
+    시작분 기준으로 정렬된 (시작분, 끝분) 구간들 사이에서 duration 분이 들어가는
+    가장 이른 시작분을 찾는다. day_end 안에 자리가 없으면 None.
+    """
+    candidate = day_start
 
-    used.sort(key=lambda x: x[0])
+    # 시작분 순으로 정렬돼 있어 끝분은 정렬돼 있지 않으므로, 끝분의 누적 최댓값(비감소)에서
+    # bisect 로 candidate 이전에 끝나는 블록들을 한 번에 건너뛴다 (그런 블록은 배치/이동에 영향 없음).
+    max_ends = list(accumulate((u_end for _, u_end in used), max))
+    i = 0
 
-    candidate = datetime.combine(today, DAY_START)
-    day_end_dt = datetime.combine(today, DAY_END)
+    # 1) day_start 기준으로 빈 구간 찾기
+    while True:
+        i = bisect_right(max_ends, candidate, i)
+        if i >= len(used):
+            break
+        u_start, u_end = used[i]
 
-    # 1) DAY_START 기준으로 빈 구간 찾기
-    for u_start, u_end in used:
         # candidate ~ candidate+duration 이 u_start 전에 끝날 수 있으면 거기 배치
         if candidate + duration <= u_start:
-            return _format_time(candidate.time()), _format_time((candidate + duration).time())
+            return candidate
 
-        # 아니면 candidate 를 u_end 뒤로 미룸
-        if candidate < u_end:
-            candidate = u_end
+        # 아니면 candidate 를 u_end 뒤로 미룸 (bisect 결과 u_end > candidate)
+        candidate = u_end
+        i += 1
 
-    # 2) 마지막 블록 뒤로 배치 (DAY_END 안에서만)
-    if candidate + duration <= day_end_dt:
-        return _format_time(candidate.time()), _format_time((candidate + duration).time())
+    # 2) 마지막 블록 뒤로 배치 (day_end 안에서만)
+    if candidate + duration <= day_end:
+        return candidate
 
-    # 3) 실패시 그냥 fallback
-    return "19:00:00", "20:30:00"
+    return None
+
+
+def _pack_slots(
+    used: List[Tuple[int, int]],
+    n_needed: int,
+    duration: int,
+    day_start: int = DAY_START_MIN,
+    day_end: int = DAY_END_MIN,
+) -> List[Tuple[int, int]]:
+    """
+    시작분 기준으로 정렬된 기존 구간들을 한 번 훑으며(sweep) 빈 구간마다 duration 분짜리
+    시간대를 앞에서부터 최대 n_needed 개 잡는다. 기존 블록과 겹치거나 day_end 를 넘는 시간대는 만들지 않는다.
+    """
+    slots: List[Tuple[int, int]] = []
+    cursor = day_start
+
+    for u_start, u_end in used:
+        gap_end = min(u_start, day_end)
+        while len(slots) < n_needed and cursor + duration <= gap_end:
+            slots.append((cursor, cursor + duration))
+            cursor += duration
+        if len(slots) >= n_needed:
+            return slots
+        # 겹치는 블록이 있으면 그 끝으로 밀어냄
+        if cursor < u_end:
+            cursor = u_end
+
+    while len(slots) < n_needed and cursor + duration <= day_end:
+        slots.append((cursor, cursor + duration))
+        cursor += duration
+
+    return slots
 
 
 def calculate_end_time(start_time_str: str, duration_minutes: int = 90) -> str:
     """
     start_time_str 에 duration_minutes 를 더해서 end_time_str 리턴.
     """
-    today = datetime.today().date()
-    start_dt = datetime.combine(today, _parse_time(start_time_str))
-    end_dt = start_dt + timedelta(minutes=duration_minutes)
-    return end_dt.strftime("%H:%M:%S")
+    start = _parse_time(start_time_str)
+    # 날짜 없이 자정 기준 초로 계산 (자정을 넘기면 24시간으로 나눈 나머지)
+    end_seconds = (start.hour * 3600 + start.minute * 60 + start.second + duration_minutes * 60) % 86400
+    return f"{end_seconds // 3600:02d}:{end_seconds // 60 % 60:02d}:{end_seconds % 60:02d}"
 
 
 def call_google_places(query: str, location: Optional[str] = None, radius: int = 5000, result_index: int = 0) -> Optional[Dict[str, Any]]:
@@ -223,6 +357,30 @@ def call_google_places(query: str, location: Optional[str] = None, radius: int =
         radius: 검색 반경 (미터 단위, 기본값: 5km)
         result_index: 결과 리스트에서 가져올 인덱스 (0부터 시작, 기본값: 0)
     """
+    return _pick_place(_search_places(query, location, radius), result_index)
+
+
+def _location_key(location: Optional[str]) -> Optional[str]:
+    """캐시 키용으로 "lat,lng"를 소수 셋째 자리(약 100m)로 반올림합니다. 파싱이 안 되면 원문 그대로."""
+    if not location:
+        return location
+    try:
+        lat, lng = location.split(",")
+        return f"{round(float(lat), 3)},{round(float(lng), 3)}"
+    except ValueError:
+        return location
+
+
+def _search_places(query: str, location: Optional[str] = None, radius: int = 5000) -> Optional[List[Dict[str, Any]]]:
+    """
+    Text Search 결과 목록(원본 항목)을 반환합니다. 결과 없거나 실패하면 None.
+    같은 쿼리의 다른 result_index 요청은 캐시된 목록에서 골라 API를 다시 호출하지 않습니다.
+    """
+    cache_key = (_normalize_name(query), _location_key(location), radius)
+    cached = _places_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
     params = {
         "query": query,
@@ -237,8 +395,8 @@ def call_google_places(query: str, location: Optional[str] = None, radius: int =
         print(f"[SEARCH] 위치 기반 검색: {location}, 반경 {radius}m")
 
     try:
-        r = requests.get(url, params=params, timeout=5)
-        data = r.json()
+        r = _SESSION.get(url, params=params, timeout=5)
+        data = json_codec.loads(r.content)
 
         if data.get("status") != "OK":
             return None
@@ -247,12 +405,35 @@ def call_google_places(query: str, location: Optional[str] = None, radius: int =
         if not results:
             return None
 
-        # result_index가 범위를 벗어나면 마지막 결과 사용
-        if result_index >= len(results):
-            result_index = len(results) - 1
+        _places_cache.set(cache_key, results)
+        return results
+    except Exception:
+        return None
+
+
+def prefetch_places(queries: List[str], location: Optional[str] = None, radius: int = 5000) -> None:
+    """
+    서로 독립적인 검색어들을 공유 스레드 풀로 동시에 조회해 결과 캐시를 채워 둡니다.
+    이후 같은 검색어의 call_google_places 호출은 네트워크 없이 캐시에서 처리됩니다.
+    """
+    unique_queries = list(dict.fromkeys(queries))
+    if len(unique_queries) < 2:
+        return
+    list(_PLACES_EXECUTOR.map(lambda q: _search_places(q, location, radius), unique_queries))
+
+
+def _pick_place(results: Optional[List[Dict[str, Any]]], result_index: int = 0) -> Optional[Dict[str, Any]]:
+    """검색 결과 목록에서 result_index 번째 항목을 장소 블록용 dict로 변환합니다."""
+    if not results:
+        return None
 
-        item = results[result_index]
+    # result_index가 범위를 벗어나면 마지막 결과 사용
+    if result_index >= len(results):
+        result_index = len(results) - 1
 
+    item = results[result_index]
+
+    try:
         place_data = {
             "placeName": item.get("name"),
             "placeRating": item.get("rating", 0.0),
@@ -262,12 +443,51 @@ def call_google_places(query: str, location: Optional[str] = None, radius: int =
             "yLocation": item["geometry"]["location"]["lat"],
             "placeLink": f"https://www.google.com/maps/place/?q=place_id:{item['place_id']}",
         }
+    except (KeyError, TypeError):
+        return None
 
-        print(f"[SEARCH] 장소 찾음 (결과 {result_index+1}번째): {place_data['placeName']}")
+    print(f"[SEARCH] 장소 찾음 (결과 {result_index+1}번째): {place_data['placeName']}")
 
-        return place_data
-    except Exception:
-        return None
+    return place_data
+
+
+def _normalize_name(name: str) -> str:
+    """검색어/장소명 비교용 정규화 (공백 정리 + 소문자)."""
+    return " ".join(name.split()).lower()
+
+
+# 기존 블록에서 재사용하는 장소 정보 필드 (call_google_places 결과와 같은 형태)
+_PLACE_FIELDS = ("placeName", "placeRating", "placeAddress", "placeId", "xLocation", "yLocation", "placeLink")
+
+
+def _index_plan_places(blocks: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    일정에 이미 있는 블록을 정규화한 placeName -> 장소 정보로 모은다.
+    placeId 와 좌표가 있는 블록만 재사용 대상이다 (같은 이름이면 첫 블록).
+    """
+    places: Dict[str, Dict[str, Any]] = {}
+    for block in blocks:
+        name = block.get("placeName")
+        if not name or not block.get("placeId") or block.get("xLocation") is None or block.get("yLocation") is None:
+            continue
+        key = _normalize_name(name)
+        if key not in places:
+            place = {field: block.get(field) for field in _PLACE_FIELDS}
+            if not place["placeLink"]:
+                place["placeLink"] = f"https://www.google.com/maps/place/?q=place_id:{place['placeId']}"
+            if place["placeRating"] is None:
+                place["placeRating"] = 0.0
+            places[key] = place
+    return places
+
+
+# detect_place_category 키워드 (숙소가 식당보다 우선)
+_STAY_KEYWORDS = ("숙소", "호텔", "게스트하우스", "모텔", "펜션", "stay")
+_FOOD_KEYWORDS = ("맛집", "식당", "카페", "음식", "저녁", "점심", "회집", "회 ")
+
+# 키워드 목록을 하나의 정규식 alternation 으로 미리 컴파일해 쿼리당 search() 한 번으로 판별
+_STAY_RE = re.compile("|".join(map(re.escape, _STAY_KEYWORDS)))
+_FOOD_RE = re.compile("|".join(map(re.escape, _FOOD_KEYWORDS)))
 
 
 def detect_place_category(query: str) -> int:
@@ -280,11 +500,11 @@ def detect_place_category(query: str) -> int:
     q = query.lower()
 
     # 숙소 / 호텔 / 게스트하우스 / 모텔 / 펜션
-    if any(k in q for k in ["숙소", "호텔", "게스트하우스", "모텔", "펜션", "stay"]):
+    if _STAY_RE.search(q):
         return 1  # 숙소
 
     # 맛집 / 식당 / 카페 / 음식 / 저녁 / 점심 / 회집 / 회
-    if any(k in q for k in ["맛집", "식당", "카페", "음식", "저녁", "점심", "회집", "회 "]):
+    if _FOOD_RE.search(q):
         return 2  # 식당
 
     # 기본은 관광지
@@ -314,12 +534,18 @@ def search_and_create_place_block(
     """
 
     existing_blocks = parse_blocks_from_plan(planContext)
+    used = _build_sorted_used_intervals(existing_blocks, timeTableId)
 
-    # planContext에서 위치 정보 가져오기
-    location = get_location_from_plan(planContext, timeTableId)
+    # planContext에서 위치 정보 가져오기 (이미 파싱한 블록으로 인덱스를 한 번만 만든다)
+    location = get_location_from_plan(planContext, timeTableId, _index_plan_locations(existing_blocks))
 
-    # 위치 기반 검색 수행
-    google_place = call_google_places(query, location=location)
+    # 같은 이름의 장소가 이미 일정에 있으면 그 정보를 재사용하고 Places 호출은 생략
+    google_place = _index_plan_places(existing_blocks).get(_normalize_name(query))
+    if google_place is not None:
+        print(f"[SEARCH] 일정에 있는 장소 재사용: {google_place['placeName']}")
+    else:
+        # 위치 기반 검색 수행
+        google_place = call_google_places(query, location=location)
 
     if google_place is None:
         return {"error": "NO_PLACE_FOUND"}
@@ -328,6 +554,7 @@ def search_and_create_place_block(
         existing_blocks=existing_blocks,
         timeTableId=timeTableId,
         duration_minutes=duration_minutes,
+        used=used,
     )
 
     place_category = detect_place_category(query)
@@ -373,43 +600,57 @@ def search_multiple_place_blocks(
         생성된 장소 블록들의 리스트
     """
     existing_blocks = parse_blocks_from_plan(planContext)
+    used = _build_sorted_used_intervals(existing_blocks, timeTableId)
     blocks: List[Dict[str, Any]] = []
 
-    # planContext에서 위치 정보 가져오기
-    location = get_location_from_plan(planContext, timeTableId)
-
-    # 첫 번째 블록 시작 시간은 기존 블록 기준으로 비어 있는 첫 구간
-    first_start_str, _ = find_non_overlapping_time(
-        existing_blocks=existing_blocks,
-        timeTableId=timeTableId,
-        duration_minutes=duration_minutes,
-    )
-    today = datetime.today().date()
-    current_start_dt = datetime.combine(today, _parse_time(first_start_str))
-    duration = timedelta(minutes=duration_minutes)
+    # planContext에서 위치 정보 가져오기 (이미 파싱한 블록으로 인덱스를 한 번만 만든다)
+    location = get_location_from_plan(planContext, timeTableId, _index_plan_locations(existing_blocks))
 
     # 같은 쿼리가 반복되는 경우를 추적하여 다른 결과를 가져오기
     query_count = {}  # 각 쿼리별 사용된 횟수 추적
+    lookups: List[Tuple[str, int]] = []
 
     for q in queries:
         # 이 쿼리가 몇 번째로 사용되는지 계산
         result_index = query_count.get(q, 0)
         query_count[q] = result_index + 1
-
-        # 위치 기반 검색 수행 (같은 쿼리면 다른 인덱스 사용)
-        google_place = call_google_places(q, location=location, result_index=result_index)
+        lookups.append((q, result_index))
+
+    # 기존 블록 사이의 빈 구간에 쿼리 수만큼 시간대를 미리 잡아 둔다 (DAY_END 안에서만)
+    packed = _pack_slots(used, len(lookups), duration_minutes, DAY_START_MIN, DAY_END_MIN)
+    if not packed:
+        return blocks
+    slots = iter(packed)
+
+    # 위치 기반 검색 수행 (같은 쿼리면 다른 인덱스 사용)
+    # 고유 쿼리마다 한 번만 검색하고(서로 독립적이므로 동시에), 반복 쿼리는 같은 결과 목록에서 다음 항목을 씁니다.
+    # 시간 배치는 아래에서 쿼리 순서대로 합니다.
+    # 일정에 이미 같은 이름의 장소가 있는 쿼리는 첫 번째 결과로 그 장소를 재사용하고,
+    # 반복되지 않으면 Places 검색을 아예 하지 않습니다.
+    plan_places = _index_plan_places(existing_blocks)
+    in_plan = {q: plan_places.get(_normalize_name(q)) for q in query_count}
+    unique_queries = [q for q in query_count if in_plan[q] is None or query_count[q] > 1]
+    results_by_query = dict(zip(
+        unique_queries,
+        _PLACES_EXECUTOR.map(lambda q: _search_places(q, location), unique_queries),
+    ))
+
+    for q, result_index in lookups:
+        if result_index == 0 and in_plan[q] is not None:
+            google_place = in_plan[q]
+        else:
+            google_place = _pick_place(results_by_query[q], result_index)
         if google_place is None:
             continue
 
-        start_dt = current_start_dt
-        end_dt = start_dt + duration
-
-        # DAY_END 넘어가면 더 이상 배치하지 않음
-        if end_dt.time() > DAY_END:
+        # 남은 빈 구간이 없으면 더 이상 배치하지 않음
+        slot = next(slots, None)
+        if slot is None:
             break
+        start_min, end_min = slot
 
-        start_str = _format_time(start_dt.time())
-        end_str = _format_time(end_dt.time())
+        start_str = _format_minutes(start_min)
+        end_str = _format_minutes(end_min)
 
         place_category = detect_place_category(q)
 
@@ -430,6 +671,5 @@ def search_multiple_place_blocks(
         }
 
         blocks.append(block)
-        current_start_dt = end_dt  # 다음 블록 시작을 방금 끝난 시간으로 이동
 
     return blocks
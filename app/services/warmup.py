@@ -0,0 +1,46 @@
+"""Background warm-up of external clients at application startup."""
+
+import logging
+import threading
+
+from app.config import settings
+from app.services.gemini import gemini_model
+from app.services.search_service import call_google_places
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _warm_gemini() -> None:
+    """짧은 ping 호출로 Gemini SDK 초기화와 TLS 세션 수립을 미리 끝냅니다."""
+    if gemini_model is None:
+        return
+    gemini_model.generate_content(
+        "ping",
+        generation_config={"max_output_tokens": 1},
+        request_options={"timeout": settings.gemini_timeout},
+    )
+
+
+def _warm_places() -> None:
+    """풀링된 세션으로 Places를 한 번 호출해 DNS 조회와 TLS 연결을 미리 열어 둡니다."""
+    if not settings.google_places_api_key:
+        return
+    call_google_places("서울역")
+
+
+_WARMUP_STEPS = (_warm_gemini, _warm_places)
+
+
+def _run_warmup() -> None:
+    for step in _WARMUP_STEPS:
+        try:
+            step()
+        except Exception as exc:  # pragma: no cover - 외부 서비스 실패는 무시
+            logger.warning("Warm-up step %s failed: %s", step.__name__, exc)
+
+
+def start_warmup() -> threading.Thread:
+    """Run the warm-up steps in a daemon thread so startup never waits on external services."""
+    thread = threading.Thread(target=_run_warmup, name="startup-warmup", daemon=True)
+    thread.start()
+    return thread
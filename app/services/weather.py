@@ -1,56 +1,72 @@
 """Weather-related helpers using the OpenWeatherMap API."""
 
-from datetime import datetime, timezone
-from typing import Any, Dict, List
-
-import requests
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List
 
 from app.config import settings
+from app.services import json_codec
+from app.services.cache import TTLCache
+from app.services.http_client import build_session
+
+# OpenWeatherMap 호출용 keep-alive 세션 (과거 날짜 병렬 조회 수만큼 풀 확보)
+_SESSION = build_session(pool_maxsize=16)
+
+# 도시별 5일 예보 원본 응답 캐시. 예보는 3시간 단위로 갱신되므로 15분 동안 재사용합니다.
+FORECAST_CACHE_TTL_SECONDS = 15 * 60
+_forecast_cache = TTLCache(maxsize=512, ttl=FORECAST_CACHE_TTL_SECONDS)
+
+
+# [수정] 사용자가 제공한 17개 광역 시/도 이미지 기준으로 CITY_DICT를 재구성
+# 하위 도시(원주, 문경, 화천 등)를 모두 제거하고, 광역 단위만 매핑합니다. (무료 OpenweatherMap api를 사용해서 그렇습니다!)
+# 호출마다 다시 만들지 않도록 모듈 상수로 둡니다.
+CITY_DICT = {
+    # 8개 특별/광역시
+    "서울특별시": "Seoul",
+    "부산광역시": "Busan",
+    "대구광역시": "Daegu",
+    "인천광역시": "Incheon",
+    "광주광역시": "Gwangju",
+    "대전광역시": "Daejeon",
+    "울산광역시": "Ulsan",
+    "세종특별자치시": "Sejong",
+
+    # 9개 도
+    "경기도": "Gyeonggi-do",
+    "강원특별자치도": "Gangwon-do", # "강원"만 쓰면 "수원"과 혼동 가능
+    "충청북도": "Chungcheongbuk-do",
+    "충청남도": "Chungcheongnam-do",
+    "전라북도": "Jeollabuk-do",
+    "전라남도": "Jeollanam-do",
+    "경상북도": "Gyeongsangbuk-do",
+    "경상남도": "Gyeongsangnam-do",
+    "제주특별자치도": "Jeju",
+}
 
+# CITY_DICT 키를 긴 이름부터 시도하는 alternation 하나로 컴파일 (입력 문자열을 한 번만 훑음)
+_CITY_PATTERN = re.compile("|".join(sorted(map(re.escape, CITY_DICT), key=len, reverse=True)))
 
+
+@lru_cache(maxsize=2048)
 def translate_city_name(city_input: str) -> str:
     """
     "광주광역시 동구", "경기도 광주시", "강원특별자치도 화천군" 같은 입력을
     OpenWeatherMap이 인식하는 "Gwangju", "Gyeonggi-do", "Gangwon-do" 등으로 변환합니다.
+    순수 테이블 조회이므로 결과는 lru_cache로 재사용합니다.
     """
-    
-    # [수정] 사용자가 제공한 17개 광역 시/도 이미지 기준으로 city_dict를 재구성
-    # 하위 도시(원주, 문경, 화천 등)를 모두 제거하고, 광역 단위만 매핑합니다. (무료 OpenweatherMap api를 사용해서 그렇습니다!)
-    city_dict = {
-        # 8개 특별/광역시
-        "서울특별시": "Seoul",
-        "부산광역시": "Busan",
-        "대구광역시": "Daegu",
-        "인천광역시": "Incheon",
-        "광주광역시": "Gwangju",
-        "대전광역시": "Daejeon",
-        "울산광역시": "Ulsan",
-        "세종특별자치시": "Sejong",
-        
-        # 9개 도
-        "경기도": "Gyeonggi-do",
-        "강원특별자치도": "Gangwon-do", # "강원"만 쓰면 "수원"과 혼동 가능
-        "충청북도": "Chungcheongbuk-do",
-        "충청남도": "Chungcheongnam-do",
-        "전라북도": "Jeollabuk-do",
-        "전라남도": "Jeollanam-do",
-        "경상북도": "Gyeongsangbuk-do",
-        "경상남도": "Gyeongsangnam-do",
-        "제주특별자치도": "Jeju",
-    }
-    
-    # [수정] 
-    # 딕셔너리 키를 순회하며 입력 문자열에 포함되는지 확인합니다.
-    # 이 로직은 `city_dict`가 상위 지역만 포함하므로 안전하게 작동합니다.
-    for kor_city in city_dict:
-        # "강원특별자치도"가 "강원특별자치도 화천군" 안에 포함되는지 확인 -> True
-        if kor_city in city_input:
-            # "Gangwon-do"를 반환
-            return city_dict[kor_city]
-            
+    # [수정]
+    # 입력 문자열에 포함된 CITY_DICT 키를 찾습니다.
+    # 이 로직은 `CITY_DICT`가 상위 지역만 포함하므로 안전하게 작동합니다.
+    # "강원특별자치도 화천군" -> "강원특별자치도" 매치 -> "Gangwon-do"
+    match = _CITY_PATTERN.search(city_input)
+    if match:
+        return CITY_DICT[match.group(0)]
+
     # 매칭되는 키가 없으면 원본 반환
     return city_input
-    # --- [수정 완료] ---
 
 
 def get_weather_forecast(city: str, target_date: datetime) -> Dict[str, Any]:
@@ -70,9 +86,10 @@ def get_weather_forecast(city: str, target_date: datetime) -> Dict[str, Any]:
             # Use Geocoding API to get lat/lon for the city
             geo_url = f"http://api.openweathermap.org/geo/1.0/direct?q={city}&limit=1&appid={settings.openweather_api_key}"
             try:
-                geo_resp = requests.get(geo_url, timeout=10)
-                if geo_resp.status_code == 200 and geo_resp.json():
-                    geo = geo_resp.json()[0]
+                geo_resp = _SESSION.get(geo_url, timeout=10)
+                geo_results = json_codec.loads(geo_resp.content) if geo_resp.status_code == 200 else None
+                if geo_results:
+                    geo = geo_results[0]
                     lat = geo.get("lat")
                     lon = geo.get("lon")
                     if lat is None or lon is None:
@@ -84,9 +101,9 @@ def get_weather_forecast(city: str, target_date: datetime) -> Dict[str, Any]:
                         f"https://api.openweathermap.org/data/2.5/onecall/timemachine?lat={lat}&lon={lon}&dt={dt_ts}"
                         f"&appid={settings.openweather_api_key}&units=metric&lang=kr"
                     )
-                    hist_resp = requests.get(hist_url, timeout=10)
+                    hist_resp = _SESSION.get(hist_url, timeout=10)
                     if hist_resp.status_code == 200:
-                        data = hist_resp.json()
+                        data = json_codec.loads(hist_resp.content)
                         # hourly field contains hourly historical datapoints
                         hourly = data.get("hourly", [])
                         if not hourly:
@@ -108,31 +125,7 @@ def get_weather_forecast(city: str, target_date: datetime) -> Dict[str, Any]:
                                 }
                             )
 
-                        if daily_forecasts:
-                            avg_temp = round(sum(f["temp"] for f in daily_forecasts) / len(daily_forecasts))
-                            avg_feels_like = round(
-                                sum(f["feels_like"] for f in daily_forecasts) / len(daily_forecasts)
-                            )
-                            avg_humidity = round(sum(f["humidity"] for f in daily_forecasts) / len(daily_forecasts))
-
-                            min_temp_of_day = min(f["temp_min"] for f in daily_forecasts)
-                            max_temp_of_day = max(f["temp_max"] for f in daily_forecasts)
-
-                            descriptions = [f["description"] for f in daily_forecasts]
-                            main_description = max(set(descriptions), key=descriptions.count) if descriptions else ""
-
-                            return {
-                                "forecasts": daily_forecasts,
-                                "summary": {
-                                    "temp": avg_temp,
-                                    "feels_like": avg_feels_like,
-                                    "humidity": avg_humidity,
-                                    "description": main_description,
-                                    "wind_speed": daily_forecasts[0]["wind_speed"],
-                                    "temp_min": min_temp_of_day,
-                                    "temp_max": max_temp_of_day,
-                                },
-                            }
+                        return _summarize_forecast_day(daily_forecasts, target_date.strftime("%Y-%m-%d"))
                     else:
                         # Historical endpoint may require paid plan or be unavailable
                         return {"error": f"Historical API 오류: {hist_resp.status_code}", "alternative": True}
@@ -153,70 +146,178 @@ def get_weather_forecast(city: str, target_date: datetime) -> Dict[str, Any]:
     if not settings.openweather_api_key:
         return {"error": "OPENWEATHER_API_KEY가 설정되지 않았습니다."}
 
+    try:
+        data = _fetch_forecast(city)
+        if "error" in data:
+            return data
+        target_date_str = target_date.strftime("%Y-%m-%d")
+        items = _group_forecast_items(data).get(target_date_str, [])
+        return _summarize_forecast_day(map(_forecast_entry, items), target_date_str)
+    except Exception as exc:  # pragma: no cover - external API call
+        return {"error": f"날씨 정보 가져오기 실패: {exc}"}
+
+
+def get_weather_forecast_range(
+    city: str, start_date: datetime, end_date: datetime, include_forecasts: bool = True
+) -> Dict[date, Dict[str, Any]]:
+    """
+    여행 기간 전체의 날씨를 날짜별로 반환합니다.
+    5일 예보 구간은 API를 한 번만 호출해 날짜별로 나누고, 과거/5일 초과 날짜는
+    get_weather_forecast와 같은 결과(히스토리컬 조회 또는 대체값 지시)를 돌려줍니다.
+    요약만 필요하면 include_forecasts=False로 예보 구간의 시간대별 항목 목록을 생략합니다.
+    """
+    today = datetime.now().date()
+    results: Dict[date, Dict[str, Any]] = {}
+    past_days: List[date] = []
+    forecast_days: List[date] = []
+
+    for offset in range((end_date.date() - start_date.date()).days + 1):
+        day = start_date.date() + timedelta(days=offset)
+        days_diff = (day - today).days
+        if days_diff < 0:
+            past_days.append(day)
+        elif days_diff > 4:
+            results[day] = {"error": "무료 API는 5일 이내 예보만 제공합니다.", "alternative": True}
+        else:
+            forecast_days.append(day)
+
+    if not past_days:
+        results.update(_forecast_for_days(city, forecast_days, include_forecasts))
+        return results
+
+    # 과거 날짜는 날짜마다 히스토리컬 요청이 필요하므로 스레드로 동시에 보내고, 그동안 예보 구간을 처리합니다.
+    with ThreadPoolExecutor(max_workers=min(8, len(past_days))) as pool:
+        past_futures = [
+            (day, pool.submit(get_weather_forecast, city, datetime(day.year, day.month, day.day)))
+            for day in past_days
+        ]
+        results.update(_forecast_for_days(city, forecast_days, include_forecasts))
+        for day, future in past_futures:
+            results[day] = future.result()
+
+    return results
+
+
+def _forecast_for_days(
+    city: str, forecast_days: List[date], include_forecasts: bool = True
+) -> Dict[date, Dict[str, Any]]:
+    """5일 예보를 한 번 조회해 forecast_days 각각의 결과로 나눕니다."""
+    if not forecast_days:
+        return {}
+
+    if not settings.openweather_api_key:
+        error: Dict[str, Any] = {"error": "OPENWEATHER_API_KEY가 설정되지 않았습니다."}
+        return {day: error for day in forecast_days}
+
+    try:
+        data = _fetch_forecast(city)
+        if "error" in data:
+            return {day: data for day in forecast_days}
+        grouped = _group_forecast_items(data)
+        results = {}
+        for day in forecast_days:
+            day_str = day.strftime("%Y-%m-%d")
+            results[day] = _summarize_forecast_day(
+                map(_forecast_entry, grouped.get(day_str, [])), day_str, include_forecasts
+            )
+        return results
+    except Exception as exc:  # pragma: no cover - external API call
+        error = {"error": f"날씨 정보 가져오기 실패: {exc}"}
+        return {day: error for day in forecast_days}
+
+
+def _fetch_forecast(city: str) -> Dict[str, Any]:
+    """5일/3시간 예보 원본 응답을 가져옵니다. 실패 시 {"error": ...}를 반환합니다.
+
+    성공한 응답만 도시별로 캐시하며, 같은 원본을 여러 날짜 요약에서 함께 씁니다.
+    """
+    cached = _forecast_cache.get(city)
+    if cached is not None:
+        return cached
+
     url = (
         f"http://api.openweathermap.org/data/2.5/forecast?q={city}"
         f"&appid={settings.openweather_api_key}&units=metric&lang=kr"
     )
+    response = _SESSION.get(url, timeout=10)
+    if response.status_code == 200:
+        data = json_codec.loads(response.content)
+        _forecast_cache.set(city, data)
+        return data
 
-    try:
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            target_date_str = target_date.strftime("%Y-%m-%d")
-            daily_forecasts: List[Dict[str, Any]] = []
-
-            for item in data.get("list", []):
-                forecast_time = datetime.fromtimestamp(item["dt"])
-                if forecast_time.strftime("%Y-%m-%d") == target_date_str:
-                    daily_forecasts.append(
-                        {
-                            "time": forecast_time.strftime("%H:%M"),
-                            "temp": round(item["main"]["temp"]),
-                            "feels_like": round(item["main"]["feels_like"]),
-                            "description": item["weather"][0]["description"],
-                            "humidity": item["main"]["humidity"],
-                            "wind_speed": item.get("wind", {}).get("speed", 0),
-                            "temp_min": round(item["main"].get("temp_min", item["main"]["temp"])),
-                            "temp_max": round(item["main"].get("temp_max", item["main"]["temp"])),
-                        }
-                    )
+    if response.status_code == 404:
+        # "Gangwon-do"로 변환했는데도 404가 발생한 경우 (OpenWeatherMap이 모르는 도시)
+        return {"error": f"도시를 찾을 수 없습니다: {city}"}
 
-            if daily_forecasts:
-                avg_temp = round(sum(f["temp"] for f in daily_forecasts) / len(daily_forecasts))
-                avg_feels_like = round(
-                    sum(f["feels_like"] for f in daily_forecasts) / len(daily_forecasts)
-                )
-                avg_humidity = round(sum(f["humidity"] for f in daily_forecasts) / len(daily_forecasts))
-                
-                min_temp_of_day = min(f["temp_min"] for f in daily_forecasts)
-                max_temp_of_day = max(f["temp_max"] for f in daily_forecasts)
-
-                descriptions = [f["description"] for f in daily_forecasts]
-                main_description = max(set(descriptions), key=descriptions.count)
-
-                return {
-                    "forecasts": daily_forecasts,
-                    "summary": {
-                        "temp": avg_temp,
-                        "feels_like": avg_feels_like,
-                        "humidity": avg_humidity,
-                        "description": main_description,
-                        "wind_speed": daily_forecasts[0]["wind_speed"],
-                        "temp_min": min_temp_of_day,
-                        "temp_max": max_temp_of_day,
-                    },
-                }
-
-            if days_diff <= 4:
-                 return {"error": f"{target_date_str}의 예보 데이터를 찾을 수 없습니다 (API 응답은 정상).", "alternative": True}
-            
-            return {"error": "해당 날짜의 예보를 찾을 수 없습니다."}
-
-        if response.status_code == 404:
-            # "Gangwon-do"로 변환했는데도 404가 발생한 경우 (OpenWeatherMap이 모르는 도시)
-            return {"error": f"도시를 찾을 수 없습니다: {city}"}
-
-        return {"error": f"API 오류: {response.status_code}"}
-    except Exception as exc:  # pragma: no cover - external API call
-        return {"error": f"날씨 정보 가져오기 실패: {exc}"}
+    return {"error": f"API 오류: {response.status_code}"}
+
+
+def _group_forecast_items(data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """예보 응답의 3시간 단위 원본 항목을 현지 날짜(YYYY-MM-DD)별로 묶습니다."""
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for item in data.get("list", []):
+        grouped.setdefault(datetime.fromtimestamp(item["dt"]).strftime("%Y-%m-%d"), []).append(item)
+    return grouped
+
+
+def _forecast_entry(item: Dict[str, Any]) -> Dict[str, Any]:
+    """예보 원본 항목 하나를 응답용 시간대별 항목으로 변환합니다."""
+    main = item["main"]
+    return {
+        "time": datetime.fromtimestamp(item["dt"]).strftime("%H:%M"),
+        "temp": round(main["temp"]),
+        "feels_like": round(main["feels_like"]),
+        "description": item["weather"][0]["description"],
+        "humidity": main["humidity"],
+        "wind_speed": item.get("wind", {}).get("speed", 0),
+        "temp_min": round(main.get("temp_min", main["temp"])),
+        "temp_max": round(main.get("temp_max", main["temp"])),
+    }
 
+
+def _summarize_forecast_day(
+    entries: Iterable[Dict[str, Any]],
+    target_date_str: str,
+    include_forecasts: bool = True,
+) -> Dict[str, Any]:
+    """하루치 예보 항목을 평균/최저/최고 기온과 대표 날씨로 요약합니다.
+
+    entries는 제너레이터여도 되며, 항목을 만들면서 바로 집계하므로 한 번만 순회합니다.
+    include_forecasts=False면 시간대별 항목 목록("forecasts")을 보관하지 않습니다.
+    """
+    forecasts: List[Dict[str, Any]] = []
+    count = total_temp = total_feels_like = total_humidity = 0
+    min_temp_of_day = float("inf")
+    max_temp_of_day = float("-inf")
+    description_counts: Counter = Counter()
+    wind_speed = 0
+    for f in entries:
+        if not count:
+            wind_speed = f["wind_speed"]
+        count += 1
+        total_temp += f["temp"]
+        total_feels_like += f["feels_like"]
+        total_humidity += f["humidity"]
+        if f["temp_min"] < min_temp_of_day:
+            min_temp_of_day = f["temp_min"]
+        if f["temp_max"] > max_temp_of_day:
+            max_temp_of_day = f["temp_max"]
+        description_counts[f["description"]] += 1
+        if include_forecasts:
+            forecasts.append(f)
+
+    if not count:
+        return {"error": f"{target_date_str}의 예보 데이터를 찾을 수 없습니다 (API 응답은 정상).", "alternative": True}
+
+    summary = {
+        "temp": round(total_temp / count),
+        "feels_like": round(total_feels_like / count),
+        "humidity": round(total_humidity / count),
+        "description": description_counts.most_common(1)[0][0],
+        "wind_speed": wind_speed,
+        "temp_min": min_temp_of_day,
+        "temp_max": max_temp_of_day,
+    }
+    if not include_forecasts:
+        return {"summary": summary}
+    return {"forecasts": forecasts, "summary": summary}
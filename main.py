@@ -8,6 +8,9 @@ import uvicorn
 
 from app import app
 
+# 서버가 포트를 열고 요청을 받을 수 있을 때까지 기다리는 최대 시간(초)
+STARTUP_TIMEOUT_SECONDS = 10
+
 
 def run_server() -> None:
     """Run the FastAPI application with uvicorn."""
@@ -17,9 +20,19 @@ def run_server() -> None:
 def run_in_thread() -> None:
     """Start the server in a background thread (useful for notebooks)."""
     print("FastAPI 서버를 백그라운드 스레드에서 시작합니다...")
-    thread = threading.Thread(target=run_server, daemon=True)
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="0.0.0.0", port=int(os.getenv("PORT", "8010")), log_level="debug")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
     thread.start()
-    time.sleep(3)
+
+    # server.started는 소켓 바인딩까지 끝난 뒤 True가 됩니다 (포트 충돌 등으로 실패하면 스레드가 종료됨).
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() >= deadline:
+            print(f"⚠️ FastAPI 서버가 {STARTUP_TIMEOUT_SECONDS}초 안에 시작되지 않았습니다. 로그를 확인하세요.")
+            return
+        time.sleep(0.05)
     print("=" * 50)
     print("✅ FastAPI 서버가 성공적으로 실행되었습니다.")
     print("🌍 로컬 접속 URL: http://localhost:8010")